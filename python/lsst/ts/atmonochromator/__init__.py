@@ -25,6 +25,7 @@ except ModuleNotFoundError:
     __version__ = "?"
 
 from .config_schema import *
+from .event_loop import *
 from .mock_controller import *
 from .model import *
 from .monochromator_csc import *
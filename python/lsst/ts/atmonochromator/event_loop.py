@@ -0,0 +1,83 @@
+# This file is part of ts_atmonochromator.
+#
+# Developed for Vera C. Rubin Observatory Telescope and Site Systems.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["LOOP_POLICY_ENV_VAR", "UVLOOP_ENV_VAR", "install_event_loop_policy"]
+
+import asyncio
+import importlib
+import logging
+import os
+
+# Set this environment variable to "1" to run with uvloop.
+UVLOOP_ENV_VAR = "TS_MONOCHROMATOR_UVLOOP"
+
+# Set this environment variable to "module:Class" to run with another
+# event loop policy, e.g. one backed by io_uring.
+LOOP_POLICY_ENV_VAR = "TS_MONOCHROMATOR_LOOP_POLICY"
+
+
+def install_event_loop_policy() -> bool:
+    """Install an alternative event loop policy, if requested.
+
+    If the ``TS_MONOCHROMATOR_LOOP_POLICY`` environment variable is set to
+    "module:Class", an instance of that class is installed as the event loop
+    policy. Otherwise, or if that class cannot be imported, the uvloop policy
+    is installed if the ``TS_MONOCHROMATOR_UVLOOP`` environment variable is
+    set to "1" and uvloop is importable.
+    It must be called before the event loop is created in order to
+    have any effect.
+
+    Returns
+    -------
+    installed : `bool`
+        True if an alternative policy was installed.
+    """
+    log = logging.getLogger(__name__)
+
+    policy_name = os.environ.get(LOOP_POLICY_ENV_VAR, "")
+    if policy_name:
+        try:
+            module_name, class_name = policy_name.split(":")
+            policy_class = getattr(importlib.import_module(module_name), class_name)
+        except Exception as e:
+            log.warning(
+                f"{LOOP_POLICY_ENV_VAR}={policy_name} could not be imported: {e!r}."
+            )
+        else:
+            if not isinstance(asyncio.get_event_loop_policy(), policy_class):
+                asyncio.set_event_loop_policy(policy_class())
+            return True
+
+    if os.environ.get(UVLOOP_ENV_VAR, "0") != "1":
+        return False
+
+    try:
+        import uvloop
+    except ImportError:
+        log.warning(
+            f"{UVLOOP_ENV_VAR}=1 but uvloop is not installed; "
+            "using the default event loop."
+        )
+        return False
+
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
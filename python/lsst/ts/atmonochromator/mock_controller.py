@@ -1,12 +1,33 @@
 __all__ = ["MockController", "SimulationConfiguration"]
 
 import asyncio
+import functools
 import logging
+import os
 import typing
 
 from lsst.ts import tcpip
 from lsst.ts.xml.enums.ATMonochromator import Status as MonochromatorStatus
 
+# Terminator for replies sent by the mock controller.
+TERMINATOR = tcpip.DEFAULT_TERMINATOR
+
+# Environment variable that overrides the simulated move duration (seconds),
+# e.g. set it to 0 to run tests and benchmarks without simulated latency.
+WAIT_TIME_ENV_VAR = "TS_MONOCHROMATOR_WAIT_TIME"
+
+
+# Scans tend to repeat the same few command arguments, so cache the
+# conversion of the raw argument tokens to numbers.
+@functools.lru_cache(maxsize=512)
+def _to_float(token: bytes) -> float:
+    return float(token)
+
+
+@functools.lru_cache(maxsize=512)
+def _to_int(token: bytes) -> int:
+    return int(token)
+
 
 class SimulationConfiguration:
     def __init__(self) -> None:
@@ -37,14 +58,17 @@ class MockServer(tcpip.OneClientReadLoopServer):
         self.device = MockController()
 
     async def read_and_dispatch(self) -> None:
-        line = await self.read_str()
+        # Work on the raw bytes from the stream; the device replies with
+        # a ready-to-send, terminated reply.
+        data = await self.readuntil(self.terminator)
+        line = data[: -len(self.terminator)]
         self.log.debug(f"{line=}")
         reply = await self.device.parse(line)
         self.log.debug(f"{reply=}")
-        await self.write_str(reply)
+        await self.write(reply)
 
     @staticmethod
-    async def connect_callback(server):
+    async def connect_callback(server: "MockServer") -> None:
         if server.connected:
             server.device.status = MonochromatorStatus.READY
         else:
@@ -65,7 +89,13 @@ class MockController:
 
         self.server: typing.Optional[asyncio.base_events.Server] = None
 
-        self.wait_time = 0.1
+        self.wait_time = float(os.environ.get(WAIT_TIME_ENV_VAR, "0.1"))
+
+        # Encoded replies to the ?WL, ?GR, ?ENS, ?EXS and ?SWST queries,
+        # keyed by reply tag. The property setters for the values they
+        # report remove the entry, and it is rebuilt the next time it is
+        # queried.
+        self._cached_replies: typing.Dict[str, bytes] = dict()
 
         # Status of the monochromator controller.
         self.status = MonochromatorStatus.OFFLINE
@@ -82,21 +112,91 @@ class MockController:
 
         self.exit_slit_position = 0.0
 
-        self._cmds = {
-            "!WL": self.set_wl,
-            "!GR": self.set_gr,
-            "!ENS": self.set_ens,
-            "!EXS": self.set_exs,
-            "!CLW": self.set_clw,
-            "!RST": self.set_rst,
-            "!SET": self.set_set,
-            "?WL": self.get_wl,
-            "?GR": self.get_gr,
-            "?ENS": self.get_ens,
-            "?EXS": self.get_exs,
-            "?SWST": self.get_swst,
+        # Encoded, terminated replies, so the hot path does not need to
+        # format or encode them.
+        self.ok_b = self.ok.encode() + TERMINATOR
+        self.our_b = self.our.encode() + TERMINATOR
+        self.invalid_b = self.invalid.encode() + TERMINATOR
+        self.busy_b = self.busy.encode() + TERMINATOR
+        self.rejected_b = self.rejected.encode() + TERMINATOR
+
+        self._cmds: typing.Dict[
+            bytes, typing.Callable[..., typing.Awaitable[bytes]]
+        ] = {
+            b"!WL": self.set_wl,
+            b"!GR": self.set_gr,
+            b"!ENS": self.set_ens,
+            b"!EXS": self.set_exs,
+            b"!CLW": self.set_clw,
+            b"!RST": self.set_rst,
+            b"!SET": self.set_set,
+            b"?WL": self.get_wl,
+            b"?GR": self.get_gr,
+            b"?ENS": self.get_ens,
+            b"?EXS": self.get_exs,
+            b"?SWST": self.get_swst,
         }
 
+    @property
+    def status(self) -> MonochromatorStatus:
+        """Status of the monochromator controller."""
+        return self._status
+
+    @status.setter
+    def status(self, status: MonochromatorStatus) -> None:
+        self._status = status
+        self._invalidate_replies("SWST")
+
+    @property
+    def wavelength(self) -> float:
+        """Wavelength (nm)."""
+        return self._wavelength
+
+    @wavelength.setter
+    def wavelength(self, wavelength: float) -> None:
+        self._wavelength = wavelength
+        self._invalidate_replies("WL")
+
+    @property
+    def wavelength_offset(self) -> float:
+        """Wavelength calibration offset (nm)."""
+        return self._wavelength_offset
+
+    @wavelength_offset.setter
+    def wavelength_offset(self, wavelength_offset: float) -> None:
+        self._wavelength_offset = wavelength_offset
+        self._invalidate_replies("WL")
+
+    @property
+    def grating(self) -> int:
+        """Selected grating."""
+        return self._grating
+
+    @grating.setter
+    def grating(self, grating: int) -> None:
+        self._grating = grating
+        self._invalidate_replies("GR")
+
+    @property
+    def entrance_slit_position(self) -> float:
+        """Entrance slit width (mm)."""
+        return self._entrance_slit_position
+
+    @entrance_slit_position.setter
+    def entrance_slit_position(self, entrance_slit_position: float) -> None:
+        self._entrance_slit_position = entrance_slit_position
+        self._invalidate_replies("ENS")
+
+    @property
+    def exit_slit_position(self) -> float:
+        """Exit slit width (mm)."""
+        return self._exit_slit_position
+
+    @exit_slit_position.setter
+    def exit_slit_position(self, exit_slit_position: float) -> None:
+        self._exit_slit_position = exit_slit_position
+        self._invalidate_replies("EXS")
+
     @property
     def exit_slit_range(self) -> typing.Tuple[float, float]:
         return self.config.min_slit_width, self.config.max_slit_width
@@ -129,32 +229,57 @@ class MockController:
     def rejected(self) -> str:
         return "#RJCT"  # Rejected
 
-    async def parse(self, line):
-        if line[0] == "?":
+    async def parse(self, line: bytes) -> bytes:
+        """Parse and execute one command.
+
+        Parameters
+        ----------
+        line : `bytes`
+            Command, without the terminator.
+
+        Returns
+        -------
+        reply : `bytes`
+            Reply to the command, including the terminator.
+        """
+        # Queries are polled far more often than anything else (status while
+        # waiting for a move, telemetry), so match them directly. Everything
+        # else, including any command added later, goes through _cmds.
+        match line:
+            case b"?SWST":
+                return await self.get_swst(None)
+            case b"?WL":
+                return await self.get_wl(None)
+            case b"?GR":
+                return await self.get_gr(None)
+            case b"?ENS":
+                return await self.get_ens(None)
+            case b"?EXS":
+                return await self.get_exs(None)
+        if line[:1] == b"?":
             cmd_name, cmd_parameters = line, None
         else:
-            line = line.split(" ")
-            cmd_name, cmd_parameters = line[0], line[1:]
+            tokens = line.split(b" ")
+            cmd_name, cmd_parameters = tokens[0], tokens[1:]
         self.log.debug(f"{cmd_name=}, {cmd_parameters=}")
-        if cmd_name in self._cmds:
-            reply = await self._cmds[cmd_name](cmd_parameters)
-            self.log.debug(f"{reply=}")
-            return reply
-        else:
-            reply = "??"
-            return reply
+        cmd = self._cmds.get(cmd_name)
+        if cmd is None:
+            return self.invalid_b
+        reply = await cmd(cmd_parameters)
+        self.log.debug(f"{reply=}")
+        return reply
 
-    async def set_wl(self, args: typing.List[str]) -> str:
+    async def set_wl(self, args: typing.List[bytes]) -> bytes:
         """Set wavelength, range.
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to a float.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to a float.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -163,46 +288,33 @@ class MockController:
                 #RJCT - Rejected
 
         """
-        if self.status != MonochromatorStatus.READY:
-            return self.rejected
-        elif self.controller_busy:
-            return self.busy
-
-        try:
-            new_wl = float(args[0])
-        except Exception:
-            return self.rejected
+        reply = self._check_can_move()
+        if reply is not None:
+            return reply
 
-        if not (self.wavelength_range[0] <= new_wl <= self.wavelength_range[1]):
-            self.log.error(f"{new_wl=} out of range; {self.wavelength_range}.")
-            return self.our
+        new_wl = self._validate_wl(args)
+        if isinstance(new_wl, bytes):
+            return new_wl
 
         # Give control back to event loop for responsiveness and to simulate
         # action
         await asyncio.sleep(self.wait_time)
 
-        self.wavelength = new_wl + self.wavelength_offset
-
-        # Make sure offset does not take values out of range
-        if self.wavelength > self.wavelength_range[1]:
-            self.wavelength = self.wavelength_range[1]
+        self._apply_wl(new_wl)
 
-        elif self.wavelength < self.wavelength_range[0]:
-            self.wavelength = self.wavelength_range[0]
+        return self.ok_b
 
-        return self.ok
-
-    async def set_gr(self, args: typing.List[str]) -> str:
+    async def set_gr(self, args: typing.List[bytes]) -> bytes:
         """Select grating.
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to an int.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to an int.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -212,18 +324,13 @@ class MockController:
 
 
         """
-        if self.status != MonochromatorStatus.READY:
-            return self.rejected
-        elif self.controller_busy:
-            return self.busy
+        reply = self._check_can_move()
+        if reply is not None:
+            return reply
 
-        try:
-            new_gr = int(args[0])
-        except Exception:
-            return self.rejected
-
-        if new_gr not in self.grating_options:
-            return self.our
+        new_gr = self._validate_gr(args)
+        if isinstance(new_gr, bytes):
+            return new_gr
 
         # Give control back to event loop for responsiveness and to simulate
         # action
@@ -231,19 +338,19 @@ class MockController:
 
         self.grating = new_gr
 
-        return self.ok
+        return self.ok_b
 
-    async def set_ens(self, args: typing.List[str]) -> str:
+    async def set_ens(self, args: typing.List[bytes]) -> bytes:
         """Select entrance slit width.
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to a float.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to a float.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -252,18 +359,13 @@ class MockController:
                 #RJCT - Rejected
 
         """
-        if self.status != MonochromatorStatus.READY:
-            return self.rejected
-        elif self.controller_busy:
-            return self.busy
-
-        try:
-            new_ens = float(args[0])
-        except Exception:
-            return self.rejected
+        reply = self._check_can_move()
+        if reply is not None:
+            return reply
 
-        if not (self.entrance_slit_range[0] <= new_ens <= self.entrance_slit_range[1]):
-            return self.our
+        new_ens = self._validate_ens(args)
+        if isinstance(new_ens, bytes):
+            return new_ens
 
         # Give control back to event loop for responsiveness and to simulate
         # action
@@ -271,19 +373,19 @@ class MockController:
 
         self.entrance_slit_position = new_ens
 
-        return self.ok
+        return self.ok_b
 
-    async def set_exs(self, args: typing.List[str]) -> str:
+    async def set_exs(self, args: typing.List[bytes]) -> bytes:
         """Select exit slit width.
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to a float.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to a float.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -292,18 +394,13 @@ class MockController:
                 #RJCT - Rejected
 
         """
-        if self.status != MonochromatorStatus.READY:
-            return self.rejected
-        elif self.controller_busy:
-            return self.busy
-
-        try:
-            new_exs = float(args[0])
-        except Exception:
-            return self.rejected
+        reply = self._check_can_move()
+        if reply is not None:
+            return reply
 
-        if not (self.exit_slit_range[0] <= new_exs <= self.exit_slit_range[1]):
-            return self.our
+        new_exs = self._validate_exs(args)
+        if isinstance(new_exs, bytes):
+            return new_exs
 
         # Give control back to event loop for responsiveness and to
         # simulate action
@@ -311,21 +408,21 @@ class MockController:
 
         self.exit_slit_position = new_exs
 
-        return self.ok
+        return self.ok_b
 
-    async def set_clw(self, args: typing.List[str]) -> str:
+    async def set_clw(self, args: typing.List[bytes]) -> bytes:
         """Calibrate the wavelength with the current value.
 
         Set the value for wavelength offset.
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to a float.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to a float.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -335,39 +432,38 @@ class MockController:
         """
 
         if self.status != MonochromatorStatus.READY:
-            return self.rejected
+            return self.rejected_b
         elif self.controller_busy:
-            return self.busy
+            return self.busy_b
 
         try:
-            new_offset = float(args[0])
+            new_offset = _to_float(args[0])
         except Exception:
-            return self.rejected
+            return self.rejected_b
 
-        exit_0 = self.exit_slit_range[0]
-        exit_1 = self.exit_slit_range[1]
+        lo, hi = self.wavelength_range
         new_w = self.wavelength + new_offset
 
-        if not (exit_0 <= new_w <= exit_1):
-            return self.our
+        if not (lo <= new_w <= hi):
+            return self.our_b
 
         self.wavelength_offset = new_offset
 
-        return self.ok
+        return self.ok_b
 
-    async def set_rst(self, args: typing.List[str]) -> str:
+    async def set_rst(self, args: typing.List[bytes]) -> bytes:
         """Reset device and go to initial state.
 
 
         Parameters
         ----------
-        args : str
-            A string of number that can be converted to an int. Must be equal
-            to 1 or it will be rejected.
+        args : `list` [`bytes`]
+            A list whose first element can be converted to an int. Must be
+            equal to 1 or it will be rejected.
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command:
                 #OK - Accepted command
                 #OUR - Out of range
@@ -378,48 +474,41 @@ class MockController:
         """
 
         if self.controller_busy:
-            return self.busy
+            return self.busy_b
 
         try:
-            value = int(args[0])
+            value = _to_int(args[0])
         except Exception as e:
             self.log.exception(e)
-            return self.rejected
+            return self.rejected_b
 
         if value != 1:
-            return self.rejected
+            return self.rejected_b
 
         self.log.debug("Starting rst")
         self.status = MonochromatorStatus.SETTING_UP
 
-        await asyncio.sleep(self.wait_time)
-
         # reset values
-        self.log.debug("Resetting wavelength")
         self.wavelength_offset = 0.0
         self.wavelength = self.wavelength_range[0]
-        await asyncio.sleep(self.wait_time)
-        self.log.debug("Resetting entrance slit")
         self.entrance_slit_position = self.entrance_slit_range[0]
-        await asyncio.sleep(self.wait_time)
-        self.log.debug("Resetting exit slit")
         self.exit_slit_position = self.exit_slit_range[0]
-        await asyncio.sleep(self.wait_time)
-        self.log.debug("Resetting grating")
         self.grating = self.grating_options[0]
+
+        # Simulate the time the reset takes, once for all axes.
         await asyncio.sleep(self.wait_time)
 
         self.status = MonochromatorStatus.READY
 
         self.log.debug("Done rst")
-        return self.ok
+        return self.ok_b
 
-    async def set_set(self, args: typing.List[str]) -> str:
+    async def set_set(self, args: typing.List[bytes]) -> bytes:
         """Set all parameters.
 
         Parameters
         ----------
-        args : list(str)
+        args : `list` [`bytes`]
             A list with the following values:
 
             * wavelength, in nm
@@ -429,7 +518,7 @@ class MockController:
 
         Returns
         -------
-        result : str
+        result : `bytes`
             Response to the set command; one of:
 
             * #OK - Accepted command
@@ -439,36 +528,37 @@ class MockController:
             * #RJCT - Rejected
         """
         if len(args) != 4:
-            return self.rejected
+            return self.rejected_b
 
-        try:
-            retval = await self.set_wl(args)
-            self.log.debug(f"set_wl({args}): {retval}")
-            if retval != self.ok:
-                return retval
-
-            retval = await self.set_gr(args[1:])
-            self.log.debug(f"set_gr({args[1:]}): {retval}")
-            if retval != self.ok:
-                return retval
-
-            retval = await self.set_ens(args[2:])
-            self.log.debug(f"set_ens({args[2:]}): {retval}")
-            if retval != self.ok:
-                return retval
-
-            retval = await self.set_exs(args[3:])
-            self.log.debug(f"set_exs({args[3:]}): {retval}")
-            if retval != self.ok:
-                return retval
+        reply = self._check_can_move()
+        if reply is not None:
+            return reply
 
-        except Exception:
+        # Validate every value before changing anything,
+        # then simulate a single move of all axes.
+        new_wl = self._validate_wl(args[0:1])
+        if isinstance(new_wl, bytes):
+            return new_wl
+        new_gr = self._validate_gr(args[1:2])
+        if isinstance(new_gr, bytes):
+            return new_gr
+        new_ens = self._validate_ens(args[2:3])
+        if isinstance(new_ens, bytes):
+            return new_ens
+        new_exs = self._validate_exs(args[3:4])
+        if isinstance(new_exs, bytes):
+            return new_exs
 
-            return self.rejected
-        else:
-            return self.ok
+        await asyncio.sleep(self.wait_time)
+
+        self._apply_wl(new_wl)
+        self.grating = new_gr
+        self.entrance_slit_position = new_ens
+        self.exit_slit_position = new_exs
 
-    async def get_wl(self, args: typing.List[str]) -> str:
+        return self.ok_b
+
+    async def get_wl(self, args: typing.Optional[typing.List[bytes]]) -> bytes:
         """Return parsed string with current wavelength.
 
         Parameters
@@ -478,13 +568,13 @@ class MockController:
 
         Returns
         -------
-        retval : str
-            A string consisting of "#WL {wavelength}"
+        retval : `bytes`
+            Encoded and terminated reply consisting of "#WL {wavelength}"
 
         """
-        return f"#WL {self.wavelength+self.wavelength_offset}"
+        return self._get_cached_reply("WL", self.wavelength + self.wavelength_offset)
 
-    async def get_gr(self, args: typing.List[str]) -> str:
+    async def get_gr(self, args: typing.Optional[typing.List[bytes]]) -> bytes:
         """Return parsed string with current grating.
 
         Parameters
@@ -494,12 +584,12 @@ class MockController:
 
         Returns
         -------
-        retval : str
-            A string consisting of "#WL {grating}
+        retval : `bytes`
+            Encoded and terminated reply consisting of "#WL {grating}
         """
-        return f"#GR {self.grating}"
+        return self._get_cached_reply("GR", self.grating)
 
-    async def get_ens(self, args: typing.List[str]) -> str:
+    async def get_ens(self, args: typing.Optional[typing.List[bytes]]) -> bytes:
         """Return parsed string with current entrance slit position.
 
         Parameters
@@ -509,12 +599,12 @@ class MockController:
 
         Returns
         -------
-        retval : str
-            A string consisting of "#WL {ens}
+        retval : `bytes`
+            Encoded and terminated reply consisting of "#WL {ens}
         """
-        return f"#ENS {self.entrance_slit_position}"
+        return self._get_cached_reply("ENS", self.entrance_slit_position)
 
-    async def get_exs(self, args: typing.List[str]) -> str:
+    async def get_exs(self, args: typing.Optional[typing.List[bytes]]) -> bytes:
         """Return parsed string with current exit slit position.
 
         Parameters
@@ -524,12 +614,12 @@ class MockController:
 
         Returns
         -------
-        retval : str
-            A string consisting of "#EXS {exs}
+        retval : `bytes`
+            Encoded and terminated reply consisting of "#EXS {exs}
         """
-        return f"#EXS {self.exit_slit_position}"
+        return self._get_cached_reply("EXS", self.exit_slit_position)
 
-    async def get_swst(self, args: typing.List[str]) -> str:
+    async def get_swst(self, args: typing.Optional[typing.List[bytes]]) -> bytes:
         """Query Software status
 
         Parameters
@@ -539,7 +629,141 @@ class MockController:
 
         Returns
         -------
-        retval : str
-            A string consisting of "#SWST {status}
+        retval : `bytes`
+            Encoded and terminated reply consisting of "#SWST {status}
+        """
+        return self._get_cached_reply("SWST", int(self.status))
+
+    def _check_can_move(self) -> typing.Optional[bytes]:
+        """Check that the controller can accept a move command.
+
+        Returns
+        -------
+        reply : `bytes` or `None`
+            None if the command can be accepted, else the error reply.
+        """
+        if self.status != MonochromatorStatus.READY:
+            return self.rejected_b
+        elif self.controller_busy:
+            return self.busy_b
+        return None
+
+    def _validate_wl(self, args: typing.List[bytes]) -> typing.Union[float, bytes]:
+        """Parse and range-check a wavelength argument.
+
+        Returns
+        -------
+        value : `float` or `bytes`
+            The wavelength (nm), or the error reply if it is invalid.
+        """
+        try:
+            new_wl = _to_float(args[0])
+        except Exception:
+            return self.rejected_b
+
+        if not (self.wavelength_range[0] <= new_wl <= self.wavelength_range[1]):
+            self.log.error(f"{new_wl=} out of range; {self.wavelength_range}.")
+            return self.our_b
+        return new_wl
+
+    def _validate_gr(self, args: typing.List[bytes]) -> typing.Union[int, bytes]:
+        """Parse and check a grating argument.
+
+        Returns
+        -------
+        value : `int` or `bytes`
+            The grating index, or the error reply if it is invalid.
+        """
+        try:
+            new_gr = _to_int(args[0])
+        except Exception:
+            return self.rejected_b
+
+        if new_gr not in self.grating_options:
+            return self.our_b
+        return new_gr
+
+    def _validate_ens(self, args: typing.List[bytes]) -> typing.Union[float, bytes]:
+        """Parse and range-check an entrance slit width argument.
+
+        Returns
+        -------
+        value : `float` or `bytes`
+            The slit width (mm), or the error reply if it is invalid.
+        """
+        try:
+            new_ens = _to_float(args[0])
+        except Exception:
+            return self.rejected_b
+
+        if not (self.entrance_slit_range[0] <= new_ens <= self.entrance_slit_range[1]):
+            return self.our_b
+        return new_ens
+
+    def _validate_exs(self, args: typing.List[bytes]) -> typing.Union[float, bytes]:
+        """Parse and range-check an exit slit width argument.
+
+        Returns
+        -------
+        value : `float` or `bytes`
+            The slit width (mm), or the error reply if it is invalid.
+        """
+        try:
+            new_exs = _to_float(args[0])
+        except Exception:
+            return self.rejected_b
+
+        if not (self.exit_slit_range[0] <= new_exs <= self.exit_slit_range[1]):
+            return self.our_b
+        return new_exs
+
+    def _apply_wl(self, new_wl: float) -> None:
+        """Set the wavelength, applying the calibration offset.
+
+        Parameters
+        ----------
+        new_wl : `float`
+            Validated wavelength (nm).
+        """
+        wavelength = new_wl + self.wavelength_offset
+
+        # Make sure offset does not take values out of range
+        if wavelength > self.wavelength_range[1]:
+            wavelength = self.wavelength_range[1]
+
+        elif wavelength < self.wavelength_range[0]:
+            wavelength = self.wavelength_range[0]
+
+        self.wavelength = wavelength
+
+    def _get_cached_reply(self, tag: str, value: typing.Any) -> bytes:
+        """Get the encoded reply to a query, building it if needed.
+
+        Parameters
+        ----------
+        tag : `str`
+            Reply tag, without the leading "#", e.g. "WL".
+        value : `typing.Any`
+            Current value; only formatted if there is no cached reply.
+
+        Returns
+        -------
+        reply : `bytes`
+            Encoded and terminated reply consisting of "#{tag} {value}".
+        """
+        reply = self._cached_replies.get(tag)
+        if reply is None:
+            reply = f"#{tag} {value}".encode() + TERMINATOR
+            self._cached_replies[tag] = reply
+        return reply
+
+    def _invalidate_replies(self, *tags: str) -> None:
+        """Discard the cached replies for the specified tags.
+
+        Parameters
+        ----------
+        tags : `str`
+            Reply tags, without the leading "#", e.g. "WL".
         """
-        return f"#SWST {int(self.status)}"
+        for tag in tags:
+            self._cached_replies.pop(tag, None)
@@ -1,11 +1,17 @@
 import asyncio
+import collections
 import enum
+import functools
 import logging
-import time
+import socket
+import typing
 
 from lsst.ts import tcpip, utils
 from lsst.ts.xml.enums.ATMonochromator import Status as MonochromatorStatus
 
+if typing.TYPE_CHECKING:
+    from .mock_controller import MockController
+
 __all__ = ["Model", "ModelReply"]
 
 
@@ -17,6 +23,84 @@ class ModelReply(enum.Enum):
     REJECTED = "#RJCT"  # Rejected
 
 
+# ModelReply keyed by the raw reply from the controller.
+_MODEL_REPLY_BY_BYTES = {reply.value.encode(): reply for reply in ModelReply}
+
+
+def _to_model_reply(cmd_reply: bytes) -> ModelReply:
+    """Convert a raw reply from the controller to a `ModelReply`.
+
+    Raises
+    ------
+    ValueError
+        If the reply is not a valid `ModelReply`.
+    """
+    try:
+        return _MODEL_REPLY_BY_BYTES[cmd_reply]
+    except KeyError:
+        return ModelReply(cmd_reply.decode())
+
+
+# MonochromatorStatus keyed by its raw value in a ?SWST reply.
+_STATUS_BY_BYTES = {
+    str(status.value).encode(): status for status in MonochromatorStatus
+}
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _encode_command(*tokens: typing.Union[str, int, float]) -> bytes:
+    """Encode a command for the controller, including the terminator.
+
+    Cached, because the same few commands are typically sent over and over
+    (e.g. while sweeping through a set of wavelengths).
+    """
+    cmd = " ".join(str(token) for token in tokens)
+    return cmd.encode() + tcpip.DEFAULT_TERMINATOR
+
+
+def _query_value(cmd_reply: bytes, tag: bytes) -> bytes:
+    """Get the raw value from the reply to a query.
+
+    Raises
+    ------
+    RuntimeError
+        If the reply does not start with ``tag``.
+    """
+    reply_tag, _, value = cmd_reply.partition(b" ")
+    if reply_tag != tag:
+        raise RuntimeError(f"Got {cmd_reply.decode()} from controller.")
+    return value
+
+
+# Encoded query commands, with the tag that starts the reply to each.
+_QUERY_WL = (_encode_command("?WL"), b"#WL")
+_QUERY_GR = (_encode_command("?GR"), b"#GR")
+_QUERY_ENS = (_encode_command("?ENS"), b"#ENS")
+_QUERY_EXS = (_encode_command("?EXS"), b"#EXS")
+_QUERY_SWST = (_encode_command("?SWST"), b"#SWST")
+
+
+class _CommandLatency:
+    """Round trip time statistics for one kind of controller command."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def __repr__(self) -> str:
+        mean = self.total / self.count if self.count else 0.0
+        return f"(count={self.count}, mean={mean:0.4f}, max={self.max:0.4f})"
+
+
 class Model:
     """A model class to represent the connection to the Monochromator. It
     implements all the available commands from the hardware and ways to select
@@ -36,29 +120,109 @@ class Model:
         self.move_timeout = 120.0
         self.move_grating_timeout = 500
 
+        # Idle time (seconds) before TCP keepalive probes are sent on the
+        # connection to the controller, so a dead peer is noticed while
+        # the CSC is connected but not commanding anything.
+        self.keepalive_idle = 30
+
+        # wait_ready polls the controller status with an exponential
+        # backoff, starting at wait_ready_min_sleeptime and doubling up to
+        # wait_ready_sleeptime (seconds).
+        self.wait_ready_min_sleeptime = 0.05
         self.wait_ready_sleeptime = 0.5
 
+        # Set when any status query (e.g. from the CSC's health monitor)
+        # finds the controller READY, and cleared otherwise;
+        # lets wait_ready return without waiting out its poll interval.
+        self._ready_event = asyncio.Event()
+
         self.connect_task = utils.make_done_future()
         self.client = tcpip.Client(host="", port=None, log=self.log)
 
-        self.cmd_lock = asyncio.Lock()
+        # Commands are pipelined: send_cmd queues a future for each command
+        # it writes and the read loop resolves them in FIFO order, as the
+        # controller replies to commands in the order it receives them.
+        # The write lock only keeps the queue in the same order as the
+        # commands on the wire; it is not held while waiting for a reply.
+        # Replies are only matched to commands by their order, so if
+        # a command times out waiting for its reply the connection is
+        # dropped; see `_drop_connection`. A cancelled command leaves its
+        # future in the queue, and the read loop discards its reply.
+        self._pending: typing.Deque[asyncio.Future] = collections.deque()
+        self._write_lock = asyncio.Lock()
+        self._read_loop_task = utils.make_done_future()
         self.controller_ready = False
 
+        # Round trip time of commands sent over TCP/IP, keyed by command
+        # name (e.g. b"?SWST"); see `pop_latency_report`.
+        self._latency: typing.Dict[bytes, _CommandLatency] = {}
+
+        # Set by connect, and cleared by disconnect, by the read loop
+        # when the connection is lost, or by `_drop_connection`;
+        # see `connected`.
+        self._connected = False
+        # Set by connect and cleared only by disconnect; unlike
+        # ``client.should_be_connected``, it stays set when the connection
+        # is lost or dropped, so that can be told apart from disconnecting.
+        self._should_be_connected = False
+
+        # Called with no arguments when the connection to the controller
+        # is lost or dropped, other than by `disconnect`.
+        self.connection_lost_callback: typing.Optional[typing.Callable[[], None]] = None
+
+        # Mock controller to talk to directly, bypassing TCP/IP;
+        # see `attach_inproc`.
+        self._inproc: typing.Optional["MockController"] = None
+
     @property
-    def connected(self):
-        return self.client.connected
+    def connected(self) -> bool:
+        """Is the client connected to the controller?"""
+        return self._connected
 
     @property
-    def should_be_connected(self):
-        return self.client.should_be_connected
+    def should_be_connected(self) -> bool:
+        """Should the client be connected to the controller?"""
+        return self._should_be_connected
+
+    def attach_inproc(self, controller: typing.Optional["MockController"]) -> None:
+        """Talk to a mock controller in this process instead of over TCP/IP.
+
+        Commands are handed directly to the mock controller, which avoids
+        the socket round trip. Intended for unit tests and simulations.
+
+        Parameters
+        ----------
+        controller : `MockController` or `None`
+            Mock controller to send commands to,
+            or None to go back to using the TCP/IP connection.
+        """
+        self._inproc = controller
 
     async def connect(self, host: str, port: str) -> None:
-        """Connect to the monochromator controller's TCP/IP port."""
+        """Connect to the monochromator controller's TCP/IP port.
+
+        Once connected, wait until the controller answers a status query,
+        so the connection is known to be usable when this returns.
+
+        Raises
+        ------
+        TimeoutError
+            If the controller does not answer within ``connection_timeout``.
+        """
         self.log.debug(f"connecting to: {host}:{port}")
         if self.connected:
             raise RuntimeError("Already connected")
         self.client = tcpip.Client(host=host, port=port, log=self.log)
         await self.client.start_task
+        self._should_be_connected = True
+        self._enable_keepalive()
+        self._connected = self.client.connected
+        self._read_loop_task = asyncio.create_task(self._read_loop())
+        try:
+            await self._handshake()
+        except Exception:
+            await self.disconnect()
+            raise
 
         self.log.debug("connected")
 
@@ -66,6 +230,10 @@ class Model:
         """Disconnect from the monochromator controller's TCP/IP port."""
         self.log.debug("disconnect")
 
+        self._connected = False
+        self._should_be_connected = False
+        self._read_loop_task.cancel()
+        self._fail_pending(ConnectionError("Disconnected from controller."))
         try:
             await self.client.close()
         except Exception:
@@ -74,6 +242,67 @@ class Model:
             self.log.debug("Closing anyway.")
             self.client = tcpip.Client(host="", port=None, log=self.log)
 
+    async def _drop_connection(
+        self, reason: str, exception: typing.Optional[Exception] = None
+    ) -> None:
+        """Drop the connection because it failed or a reply may have been
+        lost.
+
+        Called by the read loop when it fails, and when a command times out
+        waiting for its reply: replies are matched to commands by their
+        order alone, so a reply that never comes would leave every later
+        command with the reply to the one before. Fail all commands waiting
+        for a reply and close the client, so the socket does not outlive
+        the connection.
+
+        Parameters
+        ----------
+        reason : str
+            Why the connection is dropped.
+        exception : Exception, optional
+            Exception to fail the waiting commands with;
+            a `ConnectionError` with ``reason`` if None.
+        """
+        if not self._connected:
+            return
+        self.log.error(f"{reason}; dropping the connection to the controller.")
+        self._connected = False
+        if self._read_loop_task is not asyncio.current_task():
+            self._read_loop_task.cancel()
+        self._fail_pending(ConnectionError(reason) if exception is None else exception)
+        try:
+            await self.client.close()
+        except Exception:
+            self.log.exception("Failed to close the connection to the controller.")
+        self._call_connection_lost_callback()
+
+    def _call_connection_lost_callback(self) -> None:
+        if self.connection_lost_callback is not None:
+            self.connection_lost_callback()
+
+    def _enable_keepalive(self) -> None:
+        """Turn on TCP keepalive for the connection to the controller."""
+        sock = self.client.writer.get_extra_info("socket")
+        if sock is None:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Not available on all platforms (e.g. macOS).
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle
+            )
+
+    async def _handshake(self) -> None:
+        """Query the status until the controller gives a valid reply."""
+        async with asyncio.timeout(self.connection_timeout):
+            while True:
+                try:
+                    await self.get_status()
+                    return
+                except (RuntimeError, ValueError) as e:
+                    self.log.debug(f"Controller not answering yet: {e!r}")
+                    await asyncio.sleep(self.wait_ready_min_sleeptime)
+
     async def reset_controller(self) -> ModelReply:
         """Reset controller.
 
@@ -82,8 +311,8 @@ class Model:
         reply : ModelReply
 
         """
-        cmd_reply = await self.send_cmd("!RST 1")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(_encode_command("!RST", 1))
+        return _to_model_reply(cmd_reply)
 
     async def get_wavelength(self) -> float:
         """Get current wavelength.
@@ -94,13 +323,8 @@ class Model:
             In nm.
 
         """
-        cmd_reply = await self.send_cmd("?WL")
-        reply = cmd_reply.split()
-
-        if reply[0] == "#WL":
-            return float(reply[1])
-        else:
-            raise RuntimeError(f"Got {cmd_reply} from controller.")
+        value = await self._query(*_QUERY_WL)
+        return float(value)
 
     async def get_grating(self) -> int:
         """Get current grating.
@@ -110,12 +334,8 @@ class Model:
         grating : int
 
         """
-        cmd_reply = await self.send_cmd("?GR")
-        reply = cmd_reply.split()
-        if reply[0] == "#GR":
-            return int(reply[1])
-        else:
-            raise RuntimeError(f"Got {cmd_reply} from controller.")
+        value = await self._query(*_QUERY_GR)
+        return int(value)
 
     async def get_entrance_slit(self) -> float:
         """Get current entrance slit position.
@@ -126,13 +346,8 @@ class Model:
             In mm
 
         """
-        cmd_reply = await self.send_cmd("?ENS")
-        reply = cmd_reply.split()
-
-        if reply[0] == "#ENS":
-            return float(reply[1])
-        else:
-            raise RuntimeError(f"Got {cmd_reply} from controller.")
+        value = await self._query(*_QUERY_ENS)
+        return float(value)
 
     async def get_exit_slit(self) -> float:
         """Get current exit slit position.
@@ -143,12 +358,69 @@ class Model:
             In mm
 
         """
-        cmd_reply = await self.send_cmd("?EXS")
-        reply = cmd_reply.split()
-        if reply[0] == "#EXS":
-            return float(reply[1])
-        else:
-            raise RuntimeError(f"Got {cmd_reply} from controller.")
+        value = await self._query(*_QUERY_EXS)
+        return float(value)
+
+    async def get_all(self) -> typing.Tuple[float, int, float, float]:
+        """Get current wavelength, grating, entrance and exit slit positions.
+
+        The four queries are sent to the controller in a single write.
+
+        Returns
+        -------
+        wavelength : float
+            In nm.
+        grating : int
+        ens : float
+            In mm
+        exs : float
+            In mm
+        """
+        wl_reply, gr_reply, ens_reply, exs_reply = await self.send_raw_cmds(
+            (_QUERY_WL[0], _QUERY_GR[0], _QUERY_ENS[0], _QUERY_EXS[0])
+        )
+        return (
+            float(_query_value(wl_reply, _QUERY_WL[1])),
+            int(_query_value(gr_reply, _QUERY_GR[1])),
+            float(_query_value(ens_reply, _QUERY_ENS[1])),
+            float(_query_value(exs_reply, _QUERY_EXS[1])),
+        )
+
+    async def get_all_status(
+        self,
+    ) -> typing.Tuple[MonochromatorStatus, float, int, float, float]:
+        """Get controller status and current wavelength, grating, entrance
+        and exit slit positions.
+
+        The five queries are sent to the controller in a single write.
+
+        Returns
+        -------
+        status : MonochromatorStatus
+        wavelength : float
+            In nm.
+        grating : int
+        ens : float
+            In mm
+        exs : float
+            In mm
+        """
+        swst_reply, wl_reply, gr_reply, ens_reply, exs_reply = await self.send_raw_cmds(
+            (
+                _QUERY_SWST[0],
+                _QUERY_WL[0],
+                _QUERY_GR[0],
+                _QUERY_ENS[0],
+                _QUERY_EXS[0],
+            )
+        )
+        return (
+            self._parse_status(_query_value(swst_reply, _QUERY_SWST[1])),
+            float(_query_value(wl_reply, _QUERY_WL[1])),
+            int(_query_value(gr_reply, _QUERY_GR[1])),
+            float(_query_value(ens_reply, _QUERY_ENS[1])),
+            float(_query_value(exs_reply, _QUERY_EXS[1])),
+        )
 
     async def get_status(self) -> MonochromatorStatus:
         """Get controller status.
@@ -158,12 +430,21 @@ class Model:
         status : MonochromatorStatus
 
         """
-        cmd_reply = await self.send_cmd("?SWST")
-        reply = cmd_reply.split()
-        if reply[0] == "#SWST":
-            return MonochromatorStatus(int(reply[1]))
+        value = await self._query(*_QUERY_SWST)
+        return self._parse_status(value)
+
+    def _parse_status(self, value: bytes) -> MonochromatorStatus:
+        """Convert the value in a ?SWST reply to a status and note whether
+        the controller is ready.
+        """
+        status = _STATUS_BY_BYTES.get(value)
+        if status is None:
+            status = MonochromatorStatus(int(value))
+        if status == MonochromatorStatus.READY:
+            self._ready_event.set()
         else:
-            raise RuntimeError(f"Got {cmd_reply} from controller.")
+            self._ready_event.clear()
+        return status
 
     async def set_wavelength(self, value: float) -> ModelReply:
         """Set current wavelength.
@@ -181,8 +462,10 @@ class Model:
         grating = await self.get_grating()
         entry = await self.get_entrance_slit()
         ex = await self.get_exit_slit()
-        cmd_reply = await self.send_cmd(f"!SET {value} {grating} {entry} {ex}")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(
+            _encode_command("!SET", value, grating, entry, ex)
+        )
+        return _to_model_reply(cmd_reply)
 
     async def set_grating(self, value: int) -> ModelReply:
         """Set current grating.
@@ -197,8 +480,8 @@ class Model:
         reply : ModelReply
 
         """
-        cmd_reply = await self.send_cmd(f"!GR {value}")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(_encode_command("!GR", value))
+        return _to_model_reply(cmd_reply)
 
     async def set_entrance_slit(self, value: float) -> ModelReply:
         """Set current entrance slit size.
@@ -213,8 +496,8 @@ class Model:
         reply : ModelReply
 
         """
-        cmd_reply = await self.send_cmd(f"!ENS {value}")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(_encode_command("!ENS", value))
+        return _to_model_reply(cmd_reply)
 
     async def set_exit_slit(self, value: float) -> ModelReply:
         """Set current exit slit size.
@@ -229,8 +512,8 @@ class Model:
         reply : ModelReply
 
         """
-        cmd_reply = await self.send_cmd(f"!EXS {value}")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(_encode_command("!EXS", value))
+        return _to_model_reply(cmd_reply)
 
     async def set_calibrate_wavelength(self, wavelength: float) -> ModelReply:
         """Calibrate wavelength.
@@ -246,8 +529,8 @@ class Model:
         reply : ModelReply
 
         """
-        cmd_reply = await self.send_cmd(f"!CLW {wavelength}")
-        return ModelReply(cmd_reply)
+        cmd_reply = await self.send_raw_cmd(_encode_command("!CLW", wavelength))
+        return _to_model_reply(cmd_reply)
 
     async def set_all(
         self, wavelength: float, grating: int, entrance_slit: float, exit_slit: float
@@ -273,14 +556,21 @@ class Model:
         self.log.debug(
             f"Setting all: {wavelength} {grating} {entrance_slit} {exit_slit}"
         )
-        cmd_reply = await self.send_cmd(
-            f"!SET {wavelength} {grating} {entrance_slit} {exit_slit}"
+        cmd_reply = await self.send_raw_cmd(
+            _encode_command("!SET", wavelength, grating, entrance_slit, exit_slit)
         )
-        return ModelReply(cmd_reply)
+        return _to_model_reply(cmd_reply)
 
     async def wait_ready(self, cmd: str) -> bool:
         """Wait until controller is ready.
 
+        The status is polled quickly at first, then less and less often,
+        so short moves are detected promptly without flooding the
+        controller during long ones. The poll interval starts over
+        whenever the status changes, and is cut short if another status
+        query (e.g. from the CSC's health monitor) finds the controller
+        READY.
+
         Parameters
         ----------
         cmd : str
@@ -300,16 +590,21 @@ class Model:
         RuntimeError
             If monochromator controller status is FAULT or OFFLINE.
         """
-        # Wait until controller is ready again
-        start_time = time.time()
-
+        # Wait until controller is ready again. Only statuses read from
+        # now on count: replies arrive in order, so they were all
+        # requested after the command being waited on was accepted.
+        self._ready_event.clear()
+        loop = asyncio.get_running_loop()
         timeout = self.move_grating_timeout if "grating" in cmd else self.move_timeout
+        deadline = loop.time() + timeout
+        sleeptime = self.wait_ready_min_sleeptime
+        last_status = None
         while True:
 
             status = await self.get_status()
             if status == MonochromatorStatus.READY:
                 return True
-            elif time.time() > start_time + timeout:
+            elif loop.time() > deadline:
                 raise TimeoutError(f"Setting up {cmd} timed out.")
             elif status == MonochromatorStatus.FAULT:
                 raise RuntimeError(
@@ -318,37 +613,222 @@ class Model:
             elif status == MonochromatorStatus.OFFLINE:
                 raise RuntimeError(f"Controller OFFLINE while checking for {cmd}.")
 
-            await asyncio.sleep(self.wait_ready_sleeptime)
+            if status != last_status:
+                last_status = status
+                sleeptime = self.wait_ready_min_sleeptime
+            try:
+                async with asyncio.timeout(sleeptime):
+                    await self._ready_event.wait()
+            except TimeoutError:
+                pass
+            sleeptime = min(sleeptime * 2, self.wait_ready_sleeptime)
 
-    async def send_cmd(self, cmd: str, timeout: float = 2.0) -> str:
+    async def _query(self, cmd: bytes, tag: bytes) -> bytes:
+        """Send a query to the controller and return the queried value.
+
+        Parameters
+        ----------
+        cmd : bytes
+            Encoded query, including the terminator.
+        tag : bytes
+            Tag the reply must start with.
+
+        Returns
+        -------
+        value : bytes
+            Raw value from the reply.
+
+        Raises
+        ------
+        RuntimeError
+            If the reply does not start with ``tag``.
+        """
+        cmd_reply = await self.send_raw_cmd(cmd)
+        return _query_value(cmd_reply, tag)
+
+    def pop_latency_report(self) -> str:
+        """Format the command round trip time statistics and reset them.
+
+        Returns
+        -------
+        report : str
+            Count, mean and max round trip time (seconds) for each command
+            sent since the last report; empty if none were sent.
+        """
+        report = ", ".join(
+            f"{name.decode()}{stats!r}" for name, stats in self._latency.items()
+        )
+        self._latency = {}
+        return report
+
+    async def send_cmd(self, cmd: str, timeout: typing.Optional[float] = None) -> bytes:
         """Send a command to the controller and wait for the reply.
 
-        Return the decoded reply as 0 or more lines of text
-        with the final ">" stripped.
+        Return the raw reply, with the terminator stripped. The reply is
+        not decoded, so callers only convert the fields they need.
 
         Parameters
         ----------
         cmd : str
             Command to send to the controller.
-        timeout : float
-            Timeout for the command being executed (in seconds).
+        timeout : float, optional
+            Time limit for the reply (seconds); ``read_timeout`` if None.
+
+        Returns
+        -------
+        reply : bytes
+            Response from controller.
+        """
+        return await self.send_raw_cmd(
+            cmd.encode() + tcpip.DEFAULT_TERMINATOR, timeout=timeout
+        )
+
+    async def send_raw_cmd(
+        self, cmd: bytes, timeout: typing.Optional[float] = None
+    ) -> bytes:
+        """Send an encoded command to the controller and wait for the reply.
+
+        Like `send_cmd`, but the command is already encoded
+        and terminated, so it is written as is.
+
+        Parameters
+        ----------
+        cmd : bytes
+            Encoded command to send, including the terminator.
+        timeout : float, optional
+            Time limit for the reply (seconds); ``read_timeout`` if None.
 
         Returns
         -------
-        reply : str
+        reply : bytes
             Response from controller.
+
+        Raises
+        ------
+        TimeoutError
+            If the controller does not reply in time.
+            The connection is then dropped; see `_drop_connection`.
         """
+        if timeout is None:
+            timeout = self.read_timeout
+        if self._inproc is not None:
+            self.log.debug(f"Sending in-process command of: {cmd!r}")
+            async with asyncio.timeout(timeout):
+                reply = await self._inproc.parse(
+                    cmd.removesuffix(tcpip.DEFAULT_TERMINATOR)
+                )
+            return reply.rstrip()
+
         if self.connected:
-            async with self.cmd_lock:
-                self.log.debug(f"Sending command of: {cmd}")
-                # await asyncio.sleep(1)
-                await self.client.write_str(cmd)
-                # await asyncio.sleep(1)
-                reply = await self.client.read_str()
-                self.log.debug(f"Got reply of: {reply}")
-                return reply
+            loop = asyncio.get_running_loop()
+            reply_future = loop.create_future()
+            start_time = loop.time()
+            async with self._write_lock:
+                self.log.debug(f"Sending command of: {cmd!r}")
+                self._pending.append(reply_future)
+                await self.client.write(cmd)
+            try:
+                async with asyncio.timeout(timeout):
+                    reply = await reply_future
+            except asyncio.TimeoutError:
+                await self._drop_connection(
+                    f"Timed out waiting for the reply to {cmd!r}"
+                )
+                raise
+            self._record_latency(cmd, loop.time() - start_time)
+            self.log.debug(f"Got reply of: {reply}")
+            return reply
         else:
             if self.should_be_connected:
                 raise RuntimeError("Client is unexpectedly disconnected.")
             else:
                 raise RuntimeError("Client is not connected.")
+
+    def _record_latency(self, cmd: bytes, duration: float) -> None:
+        """Add the round trip time of one command to the statistics."""
+        name = cmd.split(maxsplit=1)[0]
+        stats = self._latency.get(name)
+        if stats is None:
+            stats = self._latency[name] = _CommandLatency()
+        stats.add(duration)
+
+    async def send_raw_cmds(
+        self, cmds: typing.Sequence[bytes], timeout: typing.Optional[float] = None
+    ) -> typing.List[bytes]:
+        """Send several encoded commands to the controller in one write
+        and wait for all the replies.
+
+        Parameters
+        ----------
+        cmds : sequence [bytes]
+            Encoded commands to send, each including the terminator.
+        timeout : float, optional
+            Time limit for all the replies (seconds); ``read_timeout``
+            if None.
+
+        Returns
+        -------
+        replies : list [bytes]
+            Response from controller to each command, in order.
+
+        Raises
+        ------
+        TimeoutError
+            If the controller does not reply in time.
+            The connection is then dropped; see `_drop_connection`.
+        """
+        if timeout is None:
+            timeout = self.read_timeout
+        if self._inproc is not None:
+            return [await self.send_raw_cmd(cmd, timeout=timeout) for cmd in cmds]
+
+        if self.connected:
+            loop = asyncio.get_running_loop()
+            reply_futures = [loop.create_future() for _ in cmds]
+            async with self._write_lock:
+                self.log.debug(f"Sending commands of: {cmds!r}")
+                self._pending.extend(reply_futures)
+                await self.client.write(b"".join(cmds))
+            try:
+                async with asyncio.timeout(timeout):
+                    replies = await asyncio.gather(*reply_futures)
+            except asyncio.TimeoutError:
+                await self._drop_connection(
+                    f"Timed out waiting for the replies to {cmds!r}"
+                )
+                raise
+            self.log.debug(f"Got replies of: {replies}")
+            return replies
+        else:
+            if self.should_be_connected:
+                raise RuntimeError("Client is unexpectedly disconnected.")
+            else:
+                raise RuntimeError("Client is not connected.")
+
+    async def _read_loop(self) -> None:
+        """Read replies from the controller and hand each one to the
+        oldest command waiting for a reply.
+        """
+        try:
+            while True:
+                reply = await self.client.readuntil(self.client.terminator)
+                if not self._pending:
+                    self.log.warning(f"Ignoring unexpected reply: {reply!r}")
+                    continue
+                reply_future = self._pending.popleft()
+                if not reply_future.done():
+                    reply_future.set_result(reply.rstrip())
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            await self._drop_connection(f"Connection to controller lost: {e!r}")
+        except Exception as e:
+            self.log.exception("Read loop failed.")
+            await self._drop_connection(f"Read loop failed: {e!r}", exception=e)
+
+    def _fail_pending(self, exception: Exception) -> None:
+        """Fail all commands that are waiting for a reply."""
+        while self._pending:
+            reply_future = self._pending.popleft()
+            if not reply_future.done():
+                reply_future.set_exception(exception)
@@ -1,6 +1,8 @@
 import asyncio
 import contextlib
+import functools
 import pathlib
+import time
 import traceback
 import typing
 
@@ -9,6 +11,7 @@ from lsst.ts.xml.enums.ATMonochromator import DetailedState, ErrorCode, Slit, St
 
 from . import __version__
 from .config_schema import CONFIG_SCHEMA
+from .event_loop import install_event_loop_policy
 from .mock_controller import MockServer, SimulationConfiguration
 from .model import Model, ModelReply
 
@@ -20,6 +23,58 @@ __all__ = [
 # Timeout to disconnect the TCP/IP and close the mock controller (seconds)
 DISCONNECT_TIMEOUT = 10
 
+# While the controller stays READY the health monitor queries its status
+# less often, backing off up to this multiple of the heartbeat interval.
+MAX_HEALTH_MONITOR_INTERVAL_FACTOR = 10
+
+# Interval between reports of command latency and event loop lag
+# from the health monitor (seconds).
+LATENCY_REPORT_INTERVAL = 600
+
+# (summary state, detailed state) in which the monochromator can be moved.
+_READY_STATE = (salobj.State.ENABLED, DetailedState.READY)
+
+
+def _create_eager_task(coro: typing.Coroutine) -> asyncio.Task:
+    """Create a task that starts running immediately, where supported.
+
+    On Python 3.12+ the coroutine runs synchronously until it first
+    suspends, saving a trip through the event loop; on older versions
+    this is the same as `asyncio.create_task`.
+    """
+    if hasattr(asyncio, "eager_task_factory"):
+        return asyncio.eager_task_factory(asyncio.get_running_loop(), coro)
+    return asyncio.create_task(coro)
+
+
+def _ready_command(detailed_state: DetailedState) -> typing.Callable:
+    """Decorate a ``do_`` method that commands the monochromator.
+
+    The command is rejected unless the CSC is ready, and the detailed state
+    is set to ``detailed_state`` while the command runs and back to READY
+    when it finishes, whether or not it succeeds. Accepting the command
+    also resets the health monitor to its fastest polling rate.
+
+    Parameters
+    ----------
+    detailed_state : `DetailedState`
+        Detailed state while the command runs.
+    """
+
+    def decorator(func: typing.Callable) -> typing.Callable:
+        @functools.wraps(func)
+        async def wrapper(
+            self: "MonochromatorCsc", data: salobj.type_hints.BaseMsgType
+        ) -> None:
+            self.assert_ready()
+            self.wake_health_monitor()
+            async with self.handle_detailed_state(detailed_state):
+                await func(self, data)
+
+        return wrapper
+
+    return decorator
+
 
 class MonochromatorCsc(salobj.ConfigurableCsc):
     """
@@ -53,6 +108,9 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
     valid_simulation_modes = (0, 1)
     version = __version__
 
+    # Configuration used in simulation mode; only ever read.
+    _SIM_CONFIG = SimulationConfiguration()
+
     def __init__(
         self,
         config_dir: typing.Union[str, pathlib.Path, None] = None,
@@ -71,9 +129,32 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         )
 
         self.model = Model(self.log)
+        # Report a lost connection right away, even if the health monitor
+        # has backed off.
+        self.model.connection_lost_callback = self.wake_health_monitor
+
+        # For each slit, the model methods to set and get its width and
+        # the event that reports it; used by changeSlitWidth.
+        self._slit_ops = {
+            Slit.ENTRY: (
+                self.model.set_entrance_slit,
+                self.model.get_entrance_slit,
+                self.evt_entrySlitWidth,
+            ),
+            Slit.EXIT: (
+                self.model.set_exit_slit,
+                self.model.get_exit_slit,
+                self.evt_exitSlitWidth,
+            ),
+        }
 
         self.want_connection = False
         self.health_monitor_task = utils.make_done_future()
+        # Set to ask the health monitor loop to stop.
+        self._stop_health_monitor = asyncio.Event()
+        # Set to make the health monitor loop poll right away and reset
+        # its polling interval; also set when asking it to stop.
+        self._wake_health_monitor = asyncio.Event()
 
         self.connect_task = utils.make_done_future()
         self.mock_server = None
@@ -112,11 +193,15 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
     async def set_detailed_state(self, detailed_state: DetailedState) -> None:
         """Set and publish detailed state.
 
+        A no-op if the detailed state is unchanged.
+
         Parameters
         ----------
         detailed_state : DetailedState
             New value for detailed state.
         """
+        if self.evt_detailedState.has_data and self.detailed_state == detailed_state:
+            return
         await self.evt_detailedState.set_write(detailedState=detailed_state)
 
     def assert_ready(self) -> None:
@@ -127,8 +212,8 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         ExpectedError
             If summary_state is not ENABLED or detailed state is not READY.
         """
-        self.assert_enabled()
-        if self.detailed_state != DetailedState.READY:
+        if (self.summary_state, self.detailed_state) != _READY_STATE:
+            self.assert_enabled()
             raise salobj.ExpectedError(
                 f"Detailed state={self.detailed_state!r} not READY"
             )
@@ -152,20 +237,22 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
                 f"Simulation mode {self.simulation_mode}. "
                 f"Using SimulationConfiguration instead."
             )
-            config = SimulationConfiguration()
+            config = self._SIM_CONFIG
         else:
             raise RuntimeError(
                 f"Unspecified simulation mode: {self.simulation_mode}. "
                 f"Expecting either 0 or 1."
             )
 
+        # set_write only publishes an event whose fields changed (or that
+        # has never been published), so reconfiguring with the same
+        # settings does not republish them.
         await self.evt_settingsAppliedMonoCommunication.set_write(
             ip=config.host,
             portRange=config.port,
             connectionTimeout=config.connection_timeout,
             readTimeout=config.read_timeout,
             writeTimeout=config.write_timeout,
-            force_output=True,
         )
         await self.evt_settingsAppliedMonochromatorRanges.set_write(
             wavelengthGR1=config.wavelength_gr1,
@@ -175,12 +262,10 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
             maxSlitWidth=config.max_slit_width,
             minWavelength=config.min_wavelength,
             maxWavelength=config.max_wavelength,
-            force_output=True,
         )
         await self.evt_settingsAppliedMonoHeartbeat.set_write(
             period=config.period,
             timeout=config.timeout,
-            force_output=True,
         )
 
         self.model.connection_timeout = config.connection_timeout
@@ -190,8 +275,10 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
     async def connect(self) -> None:
         """Connect to the hardware controller. Disconnect first, if connected.
 
-        If simulating, start the mock controller just before connecting.
-        After connecting, check status and start the health monitor loop.
+        If simulating, start the mock controller just before connecting,
+        unless it is already running from an earlier connection.
+        After connecting, check status: if the controller is not ready go
+        to FAULT, otherwise report the setup and start the health monitor.
         """
         await self.disconnect()
 
@@ -199,11 +286,13 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
             host = self.evt_settingsAppliedMonoCommunication.data.ip
             port = self.evt_settingsAppliedMonoCommunication.data.portRange
         elif self.simulation_mode == 1:
-            self.mock_server = MockServer()
-            await asyncio.wait_for(
-                self.mock_server.start_task,
-                timeout=SimulationConfiguration().connection_timeout,
-            )
+            if self.mock_server is None or self.mock_server.done_task.done():
+                self.mock_server = MockServer()
+            # Only arm the timeout if the mock is not already listening,
+            # e.g. when it is retained from an earlier connection.
+            if not self.mock_server.start_task.done():
+                async with asyncio.timeout(self.model.connection_timeout):
+                    await self.mock_server.start_task
             host = self.mock_server.host
             port = self.mock_server.port
         else:
@@ -213,46 +302,36 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         if not self.model.connected:
             await self.model.connect(host=host, port=port)
 
-        # For some reason I have to add this sleep here. If I try to read
-        # before that the connection unexpectedly drops.
-        await asyncio.sleep(self.model.read_timeout)
-
         # Check that the hardware status is ready, otherwise go to FAULT
         # Note that when the controller first comes up, it will be in the
         # SETTING_UP state until a status is requested, then it will
-        # become READY
-        controller_status = await self.model.get_status()
+        # become READY; Model.connect has already requested it.
+        (
+            controller_status,
+            wavelength,
+            grating,
+            entrance_slit,
+            exit_slit,
+        ) = await self.model.get_all_status()
         if controller_status != Status.READY:
             await self.fault(
                 code=ErrorCode.HARDWARE_NOT_READY,
                 report=f"Controller is not ready. Current status is "
                 f"{controller_status!r}",
             )
-        else:
-            await self.evt_status.set_write(status=controller_status)
-
-        wavelength = await self.model.get_wavelength()
-        await self.evt_wavelength.set_write(wavelength=wavelength, force_output=True)
-
-        grating = await self.model.get_grating()
-        await self.evt_selectedGrating.set_write(gratingType=grating, force_output=True)
-
-        entrance_slit = await self.model.get_entrance_slit()
-        await self.evt_entrySlitWidth.set_write(width=entrance_slit, force_output=True)
-        await self.evt_slitWidth.set_write(
-            slit=Slit.ENTRY,
-            slitPosition=entrance_slit,
+            return
+        await self.evt_status.set_write(status=controller_status)
+
+        await self.publish_setup(
+            wavelength=wavelength,
+            grating=grating,
+            entrance_slit=entrance_slit,
+            exit_slit=exit_slit,
             force_output=True,
         )
-
-        exit_slit = await self.model.get_exit_slit()
-        await self.evt_exitSlitWidth.set_write(width=exit_slit, force_output=True)
-        await self.evt_slitWidth.set_write(
-            slit=Slit.EXIT,
-            slitPosition=exit_slit,
-            force_output=True,
-        )
-        self.health_monitor_task = asyncio.create_task(self.health_monitor_loop())
+        self._stop_health_monitor.clear()
+        self._wake_health_monitor.clear()
+        self.health_monitor_task = _create_eager_task(self.health_monitor_loop())
         await self.set_detailed_state(DetailedState.READY)
 
     async def begin_start(self, data):
@@ -279,21 +358,55 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
     async def disconnect(self) -> None:
         """Disconnect from the hardware controller. A no-op if not connected.
 
-        Stop the mock controller, if running.
+        The mock controller, if running, is left running for the next
+        connection; it is stopped by `close_tasks`.
         """
-        self.health_monitor_task.cancel()
-        if self.model.connected:
-            try:
-                await asyncio.wait_for(self.model.disconnect(), DISCONNECT_TIMEOUT)
-            except asyncio.TimeoutError:
-                self.log.warning("Timed out disconnecting from controller.")
+        # Stop the health monitor and close the connection concurrently;
+        # a poll that is cut short by the disconnect is not reported as a
+        # fault, since the stop event is already set.
+        self._stop_health_monitor.set()
+        self._wake_health_monitor.set()
+        await asyncio.gather(self._wait_health_monitor_stopped(), self._close_model())
+
+    async def _wait_health_monitor_stopped(self) -> None:
+        """Wait for the health monitor loop to stop, once asked to.
+
+        Wait for the health monitor to actually stop, so it cannot race
+        with a following connect. It may be the task calling this (via
+        fault), in which case it stops once `disconnect` returns.
+        """
+        if self.health_monitor_task is asyncio.current_task():
+            return
+        # Let it stop at a clean point, but cancel it if it is stuck.
+        done, _ = await asyncio.wait(
+            [self.health_monitor_task], timeout=DISCONNECT_TIMEOUT
+        )
+        if not done:
+            self.health_monitor_task.cancel()
+            await asyncio.wait([self.health_monitor_task])
+
+    async def _close_model(self) -> None:
+        """Disconnect the model from the controller.
+
+        Also called if the connection was lost, so the model
+        no longer expects to be connected.
+        """
+        try:
+            await asyncio.wait_for(self.model.disconnect(), DISCONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.log.warning("Timed out disconnecting from controller.")
+
+    async def close_tasks(self) -> None:
+        """Disconnect and stop the mock controller, if running."""
+        await self.disconnect()
         if self.mock_server:
             try:
-                await self.mock_server.close()
+                await asyncio.wait_for(self.mock_server.close(), DISCONNECT_TIMEOUT)
             except asyncio.TimeoutError:
                 self.log.warning("Timed out stopping the mock controller.")
             finally:
                 self.mock_server = None
+        await super().close_tasks()
 
     async def handle_summary_state(self) -> None:
         """Called when the summary state has changed."""
@@ -302,20 +415,20 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
             if not self.model.connected and self.connect_task.done():
                 try:
                     await self.connect()
-                    await self.set_detailed_state(DetailedState.READY)
-                except Exception as e:
+                except Exception:
                     await self.fault(
                         code=ErrorCode.CONNECTION_FAILED,
                         report="Error trying to connect.",
                         traceback=traceback.format_exc(),
                     )
-                    raise e
+                    raise
         else:
 
             await self.set_detailed_state(DetailedState.NOT_ENABLED)
 
             await self.disconnect()
 
+    @_ready_command(DetailedState.CALIBRATING_WAVELENGTH)
     async def do_calibrateWavelength(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Calibrate wavelength.
 
@@ -324,18 +437,15 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         data : ``cmd_calibrateWavelength.DataType``
             Command data
         """
-        self.assert_ready()
-
-        async with self.handle_detailed_state(DetailedState.CALIBRATING_WAVELENGTH):
-
-            reply = await self.model.set_calibrate_wavelength(data.wavelength)
-            if reply != ModelReply.OK:
-                raise RuntimeError(f"Got {reply!r} from controller.")
-            await self.cmd_calibrateWavelength.ack_in_progress(
-                data=data, timeout=self.model.move_timeout, result=""
-            )
-            await self.model.wait_ready("calibrate wavelength")
+        reply = await self.model.set_calibrate_wavelength(data.wavelength)
+        if reply != ModelReply.OK:
+            raise RuntimeError(f"Got {reply!r} from controller.")
+        await self.cmd_calibrateWavelength.ack_in_progress(
+            data=data, timeout=self.model.move_timeout, result=""
+        )
+        await self.model.wait_ready("calibrate wavelength")
 
+    @_ready_command(DetailedState.CHANGING_SLIT_WIDTH)
     async def do_changeSlitWidth(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Change slit width.
 
@@ -344,37 +454,25 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         data : ``cmd_changeSlitWidth.DataType``
             Command data
         """
-        self.assert_ready()
-
-        async with self.handle_detailed_state(DetailedState.CHANGING_SLIT_WIDTH):
-
-            if data.slit == Slit.ENTRY:
-                reply = await self.model.set_entrance_slit(data.slitWidth)
-            elif data.slit == Slit.EXIT:
-                reply = await self.model.set_exit_slit(data.slitWidth)
-            else:
-                raise RuntimeError(f"Unrecognized slit {data.slit}.")
-
-            if reply != ModelReply.OK:
-                raise RuntimeError(f"Got {reply!r} from controller.")
-            else:
-                await self.cmd_changeSlitWidth.ack_in_progress(
-                    data=data, timeout=self.model.move_timeout, result=""
-                )
-                await self.model.wait_ready("change slit width")
+        slit_ops = self._slit_ops.get(data.slit)
+        if slit_ops is None:
+            raise RuntimeError(f"Unrecognized slit {data.slit}.")
+        set_slit_width, get_slit_width, evt_slit_width = slit_ops
+        reply = await set_slit_width(data.slitWidth)
+
+        if reply != ModelReply.OK:
+            raise RuntimeError(f"Got {reply!r} from controller.")
+        else:
+            await self.cmd_changeSlitWidth.ack_in_progress(
+                data=data, timeout=self.model.move_timeout, result=""
+            )
+            await self.model.wait_ready("change slit width")
 
-                if data.slit == Slit.ENTRY:
-                    new_pos = await self.model.get_entrance_slit()
-                    await self.evt_entrySlitWidth.set_write(
-                        width=new_pos, force_output=True
-                    )
-                elif data.slit == Slit.EXIT:
-                    new_pos = await self.model.get_exit_slit()
-                    await self.evt_exitSlitWidth.set_write(
-                        width=new_pos, force_output=True
-                    )
-                await self.evt_slitWidth.set_write(slit=data.slit, slitPosition=new_pos)
+            new_pos = await get_slit_width()
+            await evt_slit_width.set_write(width=new_pos)
+            await self.evt_slitWidth.set_write(slit=data.slit, slitPosition=new_pos)
 
+    @_ready_command(DetailedState.CHANGING_WAVELENGTH)
     async def do_changeWavelength(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Change wavelength.
 
@@ -383,24 +481,20 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         data : ``cmd_changeWavelength.DataType``
             Command data
         """
-        self.assert_ready()
-
-        async with self.handle_detailed_state(DetailedState.CHANGING_WAVELENGTH):
+        reply = await self.model.set_wavelength(data.wavelength)
 
-            reply = await self.model.set_wavelength(data.wavelength)
-
-            if reply != ModelReply.OK:
-                raise RuntimeError(f"Got {reply} from controller.")
-            else:
-                await self.cmd_changeWavelength.ack_in_progress(
-                    data=data,
-                    timeout=self.model.move_timeout,
-                    result="Waiting for wavelength change.",
-                )
-                await self.model.wait_ready("change wavelength")
+        if reply != ModelReply.OK:
+            raise RuntimeError(f"Got {reply} from controller.")
+        else:
+            await self.cmd_changeWavelength.ack_in_progress(
+                data=data,
+                timeout=self.model.move_timeout,
+                result="Waiting for wavelength change.",
+            )
+            await self.model.wait_ready("change wavelength")
 
-                wavelength = await self.model.get_wavelength()
-                await self.evt_wavelength.set_write(wavelength=wavelength)
+            wavelength = await self.model.get_wavelength()
+            await self.evt_wavelength.set_write(wavelength=wavelength)
 
     async def do_power(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Power up controller.
@@ -420,6 +514,7 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         self.assert_enabled()
         raise NotImplementedError("Power command not implemented.")
 
+    @_ready_command(DetailedState.SELECTING_GRATING)
     async def do_selectGrating(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Select grating.
 
@@ -428,25 +523,20 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         data : ``cmd_selectGrating.DataType``
             Command data
         """
-        self.assert_ready()
-
-        async with self.handle_detailed_state(DetailedState.SELECTING_GRATING):
-
-            reply = await self.model.set_grating(data.gratingType)
+        reply = await self.model.set_grating(data.gratingType)
 
-            if reply != ModelReply.OK:
-                raise RuntimeError(f"Got {reply} from controller.")
-            else:
-                await self.cmd_selectGrating.ack_in_progress(
-                    data=data, timeout=self.model.move_grating_timeout, result=""
-                )
-                await self.model.wait_ready("select grating")
+        if reply != ModelReply.OK:
+            raise RuntimeError(f"Got {reply} from controller.")
+        else:
+            await self.cmd_selectGrating.ack_in_progress(
+                data=data, timeout=self.model.move_grating_timeout, result=""
+            )
+            await self.model.wait_ready("select grating")
 
-                grating = await self.model.get_grating()
-                await self.evt_selectedGrating.set_write(
-                    gratingType=grating, force_output=True
-                )
+            grating = await self.model.get_grating()
+            await self.evt_selectedGrating.set_write(gratingType=grating)
 
+    @_ready_command(DetailedState.UPDATING_SETUP)
     async def do_updateMonochromatorSetup(
         self, data: salobj.type_hints.BaseMsgType
     ) -> None:
@@ -458,100 +548,201 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         data : ``cmd_updateMonochromatorSetup``
             Command data
         """
-        self.assert_ready()
-
-        async with self.handle_detailed_state(DetailedState.UPDATING_SETUP):
+        reply = await self.model.set_all(
+            wavelength=data.wavelength,
+            grating=data.gratingType,
+            entrance_slit=data.fontEntranceSlitWidth,
+            exit_slit=data.fontExitSlitWidth,
+        )
 
-            reply = await self.model.set_all(
-                wavelength=data.wavelength,
-                grating=data.gratingType,
-                entrance_slit=data.fontEntranceSlitWidth,
-                exit_slit=data.fontExitSlitWidth,
+        if reply != ModelReply.OK:
+            raise RuntimeError(f"Got {reply} from controller.")
+        else:
+            await self.cmd_updateMonochromatorSetup.ack_in_progress(
+                data=data,
+                timeout=self.model.move_grating_timeout,
+                result="Waiting for movement",
+            )
+            await self.model.wait_ready("update monochromator setup.")
+
+            wavelength, grating, entrance_slit, exit_slit = await self.model.get_all()
+            await self.publish_setup(
+                wavelength=wavelength,
+                grating=grating,
+                entrance_slit=entrance_slit,
+                exit_slit=exit_slit,
             )
 
-            if reply != ModelReply.OK:
-                raise RuntimeError(f"Got {reply} from controller.")
-            else:
-                await self.cmd_updateMonochromatorSetup.ack_in_progress(
-                    data=data,
-                    timeout=self.model.move_grating_timeout,
-                    result="Waiting for movement",
-                )
-                await self.model.wait_ready("update monochromator setup.")
-
-                wavelength = await self.model.get_wavelength()
-                await self.evt_wavelength.set_write(
-                    wavelength=wavelength, force_output=True
-                )
-
-                grating = await self.model.get_grating()
-                await self.evt_selectedGrating.set_write(
-                    gratingType=grating, force_output=True
-                )
+    async def publish_setup(
+        self,
+        wavelength: float,
+        grating: int,
+        entrance_slit: float,
+        exit_slit: float,
+        force_output: bool = False,
+    ) -> None:
+        """Publish the wavelength, grating and slit width events.
 
-                entrance_slit = await self.model.get_entrance_slit()
-                await self.evt_entrySlitWidth.set_write(
-                    width=entrance_slit, force_output=True
-                )
-                await self.evt_slitWidth.set_write(
-                    slit=Slit.ENTRY,
-                    slitPosition=entrance_slit,
-                    force_output=True,
-                )
+        Parameters
+        ----------
+        wavelength : float
+            Wavelength (nm).
+        grating : int
+            Selected grating.
+        entrance_slit : float
+            Entrance slit width (mm).
+        exit_slit : float
+            Exit slit width (mm).
+        force_output : bool, optional
+            Publish the events even if unchanged?
+        """
+        await self.evt_wavelength.set_write(
+            wavelength=wavelength, force_output=force_output
+        )
+        await self.evt_selectedGrating.set_write(
+            gratingType=grating, force_output=force_output
+        )
+        await self.evt_entrySlitWidth.set_write(
+            width=entrance_slit, force_output=force_output
+        )
+        await self.evt_slitWidth.set_write(
+            slit=Slit.ENTRY,
+            slitPosition=entrance_slit,
+            force_output=force_output,
+        )
+        await self.evt_exitSlitWidth.set_write(
+            width=exit_slit, force_output=force_output
+        )
+        await self.evt_slitWidth.set_write(
+            slit=Slit.EXIT,
+            slitPosition=exit_slit,
+            force_output=force_output,
+        )
 
-                exit_slit = await self.model.get_exit_slit()
-                await self.evt_exitSlitWidth.set_write(
-                    width=exit_slit, force_output=True
-                )
-                await self.evt_slitWidth.set_write(
-                    slit=Slit.EXIT,
-                    slitPosition=exit_slit,
-                    force_output=True,
-                )
+    def wake_health_monitor(self) -> None:
+        """Make the health monitor query the controller status now,
+        and reset its query interval to the heartbeat interval.
+        """
+        self._wake_health_monitor.set()
 
     async def health_monitor_loop(self) -> None:
-        """Monitor the state of the hardware."""
+        """Monitor the state of the hardware.
+
+        Write the timestamp and loopTime telemetry every
+        ``heartbeat_interval`` seconds. Query the controller status at the
+        same rate, but while the controller stays READY, double the query
+        interval after each query, up to ``MAX_HEALTH_MONITOR_INTERVAL_FACTOR``
+        times the heartbeat interval. Any change of status or call to
+        `wake_health_monitor` (which commands and a lost connection make)
+        resets it and queries right away; so does finding the model
+        disconnected at a heartbeat.
+
+        Every ``LATENCY_REPORT_INTERVAL`` seconds, log the round trip time
+        of the commands sent to the controller and the largest delay
+        in waking up on schedule, as a measure of event loop lag.
+        """
 
-        start_tai = utils.current_tai()
+        # loopTime is measured with the monotonic clock, so that steps in
+        # the system clock do not affect it; timestamp is TAI, as usual.
+        start_time = time.monotonic()
+        # Write telemetry on a fixed schedule, so the time spent talking
+        # to the controller does not make the cadence drift.
+        next_deadline = start_time
+        next_query = start_time
+        report_deadline = start_time + LATENCY_REPORT_INTERVAL
+        max_loop_lag = 0.0
         self.log.debug("starting health monitor loop.")
 
-        while True:
+        # Bind what is used on every tick once, up front.
+        stop_event = self._stop_health_monitor
+        wake_event = self._wake_health_monitor
+        model = self.model
+        get_status = model.get_status
+        evt_status = self.evt_status
+        tel_timestamp = self.tel_timestamp
+        tel_loop_time = self.tel_loopTime
+        heartbeat_interval = self.heartbeat_interval
+        max_interval = MAX_HEALTH_MONITOR_INTERVAL_FACTOR * heartbeat_interval
+        query_interval = heartbeat_interval
+
+        while not stop_event.is_set():
             try:
-                self.log.debug(
-                    f"{self.model.connected=}, {self.model.should_be_connected=}"
-                )
-                controller_status = await self.model.get_status()
-                await self.evt_status.set_write(status=controller_status)
-                if controller_status == Status.FAULT:
-                    await self.fault(
-                        code=ErrorCode.HARDWARE_ERROR,
-                        report="Hardware controller reported FAULT.",
-                        traceback="",
+                now = time.monotonic()
+                if now >= next_query or not model.connected:
+                    self.log.debug(
+                        "connected=%s, should_be_connected=%s",
+                        model.connected,
+                        model.should_be_connected,
                     )
-                    return
-                curr_tai = utils.current_tai()
-                await self.tel_timestamp.set_write(timestamp=curr_tai)
-                await self.tel_loopTime.set_write(loopTime=curr_tai - start_tai)
-                await asyncio.sleep(self.heartbeat_interval)
+                    controller_status = await get_status()
+                    # The status rarely changes; skip set_write unless it did.
+                    if (
+                        not evt_status.has_data
+                        or evt_status.data.status != controller_status
+                    ):
+                        await evt_status.set_write(status=controller_status)
+                        query_interval = heartbeat_interval
+                    elif controller_status == Status.READY:
+                        query_interval = min(query_interval * 2, max_interval)
+                    if controller_status == Status.FAULT:
+                        await self.fault(
+                            code=ErrorCode.HARDWARE_ERROR,
+                            report="Hardware controller reported FAULT.",
+                            traceback="",
+                        )
+                        return
+                    next_query = now + query_interval
+                    now = time.monotonic()
+                if now >= next_deadline:
+                    # Telemetry is written every tick, so update the samples
+                    # in place rather than going through set_write.
+                    tel_timestamp.data.timestamp = utils.current_tai()
+                    await tel_timestamp.write()
+                    tel_loop_time.data.loopTime = now - start_time
+                    await tel_loop_time.write()
+                    # If we fell behind, start a new schedule from now
+                    # rather than writing back-to-back to catch up.
+                    next_deadline = max(next_deadline + heartbeat_interval, now)
+                # Sleep until the next tick or query, whichever comes first,
+                # but wake up right away to stop or to query again.
+                wake_time = min(next_deadline, next_query)
+                try:
+                    async with asyncio.timeout(wake_time - time.monotonic()):
+                        await wake_event.wait()
+                except TimeoutError:
+                    now = time.monotonic()
+                    max_loop_lag = max(max_loop_lag, now - wake_time)
+                    if now >= report_deadline:
+                        self.log.info(
+                            "Max event loop lag=%0.4f s; command latency: %s",
+                            max_loop_lag,
+                            model.pop_latency_report(),
+                        )
+                        report_deadline = now + LATENCY_REPORT_INTERVAL
+                        max_loop_lag = 0.0
+                else:
+                    wake_event.clear()
+                    query_interval = heartbeat_interval
+                    next_query = time.monotonic()
             except Exception:
+                if stop_event.is_set():
+                    # Failed because we are disconnecting; not a fault.
+                    break
                 self.log.debug(
                     f"{self.model.connected=}, {self.model.should_be_connected=}"
                 )
                 if not self.model.connected and self.model.should_be_connected:
-                    await self.fault(
-                        code=ErrorCode.MISC,
-                        report="Health monitor loop unexpectedly lost connection.",
-                        traceback=traceback.format_exc(),
-                    )
-                    self.log.debug("closing health monitor loop.")
-                    return
+                    report = "Health monitor loop unexpectedly lost connection."
                 else:
-                    await self.fault(
-                        code=ErrorCode.MISC,
-                        report="Monitor health loop unexpectedly failed.",
-                        traceback=traceback.format_exc(),
-                    )
-                    return
+                    report = "Monitor health loop unexpectedly failed."
+                await self.fault(
+                    code=ErrorCode.MISC,
+                    report=report,
+                    traceback=traceback.format_exc(),
+                )
+                self.log.debug("closing health monitor loop.")
+                return
+        self.log.debug("health monitor loop stopped.")
 
     @contextlib.asynccontextmanager
     async def handle_detailed_state(
@@ -569,9 +760,10 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
         detailed_state_final : DetailedState, optional
             Final detailed state. By default, DetailedState.READY.
         """
-
+        # Only restore the final state once the initial one is set;
+        # if setting it fails there is nothing to undo.
+        await self.set_detailed_state(detailed_state=detailed_state_initial)
         try:
-            await self.set_detailed_state(detailed_state=detailed_state_initial)
             yield
         finally:
             await self.set_detailed_state(detailed_state=detailed_state_final)
@@ -579,4 +771,7 @@ class MonochromatorCsc(salobj.ConfigurableCsc):
 
 def run_atmonochromator():
     """Run ATMonochromator CSC."""
+    # Install the requested event loop policy (if any) before the event loop
+    # is created, rather than relying on it having been done on import.
+    install_event_loop_policy()
     asyncio.run(MonochromatorCsc.amain(index=False))
@@ -0,0 +1,26 @@
+# This file is part of ts_atmonochromator.
+#
+# Developed for the LSST Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+from lsst.ts.atmonochromator import install_event_loop_policy
+
+# Importing the package does not change the event loop policy, so install
+# the one requested in the environment (if any) before any test runs.
+install_event_loop_policy()
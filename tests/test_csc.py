@@ -19,19 +19,42 @@
 # You should have received a copy of the GNU General Public License
 
 import asyncio
-import glob
-import os
 import pathlib
 import typing
 import unittest
+from unittest import mock
 
 from lsst.ts import atmonochromator, salobj
+from lsst.ts.atmonochromator import monochromator_csc
+from lsst.ts.atmonochromator.mock_controller import MockServer
 from lsst.ts.xml.enums import ATMonochromator
 
 TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
 
-STD_TIMEOUT = 60
-LONG_TIMEOUT = 120.0
+# Names of configuration files the CSC should reject.
+INVALID_CONFIGS = [
+    *(path.name for path in TEST_CONFIG_DIR.glob("invalid_*.yaml")),
+    "no_such_file.yaml",
+]
+
+# Configuration the CSC uses in simulation mode.
+SIM_CONFIG = atmonochromator.SimulationConfiguration()
+
+STD_TIMEOUT = 10
+# Timeout for events from a command that has already finished.
+EVENT_TIMEOUT = 5
+
+
+class NotReadyMockServer(MockServer):
+    """Mock server whose controller is not ready once a client connects."""
+
+    @staticmethod
+    async def connect_callback(server: MockServer) -> None:
+        server.device.status = (
+            ATMonochromator.Status.SETTING_UP
+            if server.connected
+            else ATMonochromator.Status.OFFLINE
+        )
 
 
 class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
@@ -57,56 +80,59 @@ class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTes
         async with self.make_csc(initial_state=salobj.State.ENABLED, simulation_mode=1):
 
             # check settings applied events
-            sim_config = atmonochromator.SimulationConfiguration()
-            await self.assert_next_sample(
-                topic=self.remote.evt_settingsAppliedMonoCommunication,
-                ip=sim_config.host,
-                portRange=sim_config.port,
-                connectionTimeout=sim_config.connection_timeout,
-                readTimeout=sim_config.read_timeout,
-                writeTimeout=sim_config.write_timeout,
-            )
-            await self.assert_next_sample(
-                topic=self.remote.evt_settingsAppliedMonochromatorRanges,
-                wavelengthGR1=sim_config.wavelength_gr1,
-                wavelengthGR1_GR2=sim_config.wavelength_gr1_gr2,
-                wavelengthGR2=sim_config.wavelength_gr2,
-                minSlitWidth=sim_config.min_slit_width,
-                maxSlitWidth=sim_config.max_slit_width,
-                minWavelength=sim_config.min_wavelength,
-                maxWavelength=sim_config.max_wavelength,
-            )
-            await self.assert_next_sample(
-                topic=self.remote.evt_settingsAppliedMonoHeartbeat,
-                period=sim_config.period,
-                timeout=sim_config.timeout,
-            )
-            await self.assert_next_sample(
-                topic=self.remote.evt_status, status=ATMonochromator.Status.READY
-            )
-            await self.assert_next_sample(
-                topic=self.remote.evt_wavelength,
-                wavelength=self.csc.mock_server.device.wavelength,
-            )
-            await self.assert_next_sample(
-                topic=self.remote.evt_selectedGrating,
-                gratingType=self.csc.mock_server.device.grating,
-            )
-            entrance_slit = await self.assert_next_sample(
-                topic=self.remote.evt_entrySlitWidth,
-                width=self.csc.mock_server.device.entrance_slit_position,
+            # Each of these topics is only checked once, so they can be
+            # read concurrently.
+            *_, entrance_slit, exit_slit = await asyncio.gather(
+                self.assert_next_sample(
+                    topic=self.remote.evt_settingsAppliedMonoCommunication,
+                    ip=SIM_CONFIG.host,
+                    portRange=SIM_CONFIG.port,
+                    connectionTimeout=SIM_CONFIG.connection_timeout,
+                    readTimeout=SIM_CONFIG.read_timeout,
+                    writeTimeout=SIM_CONFIG.write_timeout,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_settingsAppliedMonochromatorRanges,
+                    wavelengthGR1=SIM_CONFIG.wavelength_gr1,
+                    wavelengthGR1_GR2=SIM_CONFIG.wavelength_gr1_gr2,
+                    wavelengthGR2=SIM_CONFIG.wavelength_gr2,
+                    minSlitWidth=SIM_CONFIG.min_slit_width,
+                    maxSlitWidth=SIM_CONFIG.max_slit_width,
+                    minWavelength=SIM_CONFIG.min_wavelength,
+                    maxWavelength=SIM_CONFIG.max_wavelength,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_settingsAppliedMonoHeartbeat,
+                    period=SIM_CONFIG.period,
+                    timeout=SIM_CONFIG.timeout,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_status, status=ATMonochromator.Status.READY
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_wavelength,
+                    wavelength=self.csc.mock_server.device.wavelength,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_selectedGrating,
+                    gratingType=self.csc.mock_server.device.grating,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_entrySlitWidth,
+                    width=self.csc.mock_server.device.entrance_slit_position,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_exitSlitWidth,
+                    width=self.csc.mock_server.device.exit_slit_position,
+                ),
             )
+
+            # slitWidth is published for each slit in turn.
             await self.assert_next_sample(
                 topic=self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.ENTRY,
                 slitPosition=entrance_slit.width,
             )
-
-            exit_slit = await self.assert_next_sample(
-                topic=self.remote.evt_exitSlitWidth,
-                width=self.csc.mock_server.device.exit_slit_position,
-            )
-
             await self.assert_next_sample(
                 topic=self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.EXIT,
@@ -123,10 +149,7 @@ class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTes
         async with self.make_csc(simulation_mode=1, config_dir=TEST_CONFIG_DIR):
             await self.assert_next_summary_state(salobj.State.STANDBY)
 
-            invalid_files = glob.glob(os.path.join(TEST_CONFIG_DIR, "invalid_*.yaml"))
-            bad_config_names = [os.path.basename(name) for name in invalid_files]
-            bad_config_names.append("no_such_file.yaml")
-            for bad_config_name in bad_config_names:
+            for bad_config_name in INVALID_CONFIGS:
                 with self.subTest(bad_config_name=bad_config_name):
                     with salobj.assertRaisesAckError():
                         await self.remote.cmd_start.set_start(
@@ -179,33 +202,35 @@ class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTes
                 self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.ENTRY,
                 slitPosition=6,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
             await self.assert_next_sample(
                 self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.EXIT,
                 slitPosition=5,
-                timeout=STD_TIMEOUT,
-            )
-            await self.assert_next_sample(
-                self.remote.evt_wavelength,
-                wavelength=600,
-                timeout=STD_TIMEOUT,
-            )
-            await self.assert_next_sample(
-                self.remote.evt_selectedGrating,
-                gratingType=ATMonochromator.Grating.RED,
-                timeout=STD_TIMEOUT,
-            )
-            await self.assert_next_sample(
-                self.remote.evt_entrySlitWidth,
-                width=6,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
-            await self.assert_next_sample(
-                self.remote.evt_exitSlitWidth,
-                width=5,
-                timeout=STD_TIMEOUT,
+            await asyncio.gather(
+                self.assert_next_sample(
+                    self.remote.evt_wavelength,
+                    wavelength=600,
+                    timeout=EVENT_TIMEOUT,
+                ),
+                self.assert_next_sample(
+                    self.remote.evt_selectedGrating,
+                    gratingType=ATMonochromator.Grating.RED,
+                    timeout=EVENT_TIMEOUT,
+                ),
+                self.assert_next_sample(
+                    self.remote.evt_entrySlitWidth,
+                    width=6,
+                    timeout=EVENT_TIMEOUT,
+                ),
+                self.assert_next_sample(
+                    self.remote.evt_exitSlitWidth,
+                    width=5,
+                    timeout=EVENT_TIMEOUT,
+                ),
             )
 
     async def test_change_wavelength(self):
@@ -235,12 +260,12 @@ class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTes
                 self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.ENTRY,
                 slitPosition=6,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
             await self.assert_next_sample(
                 self.remote.evt_entrySlitWidth,
                 width=6,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
 
     async def test_change_slit_width_exit(self):
@@ -257,31 +282,72 @@ class TestATMonochromatorCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTes
                 self.remote.evt_slitWidth,
                 slit=ATMonochromator.Slit.EXIT,
                 slitPosition=5,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
             await self.assert_next_sample(
                 self.remote.evt_exitSlitWidth,
                 width=5,
-                timeout=STD_TIMEOUT,
+                timeout=EVENT_TIMEOUT,
             )
 
     async def test_select_grating(self):
         async with self.make_csc(simulation_mode=1, initial_state=salobj.State.ENABLED):
             self.remote.evt_selectedGrating.flush()
 
-            for grating in ATMonochromator.Grating:
-                await self.remote.cmd_selectGrating.set_start(
-                    gratingType=grating,
-                    timeout=STD_TIMEOUT,
-                )
-                await self.assert_next_sample(
-                    self.remote.evt_selectedGrating,
-                    gratingType=grating,
-                    timeout=STD_TIMEOUT,
-                )
+            # selectedGrating is only published when the grating changes,
+            # so select the current grating last.
+            gratings = sorted(
+                ATMonochromator.Grating,
+                key=lambda grating: grating == self.csc.grating,
+            )
+            for grating in gratings:
+                with self.subTest(grating=grating):
+                    await self.remote.cmd_selectGrating.set_start(
+                        gratingType=grating,
+                        timeout=STD_TIMEOUT,
+                    )
+                    await self.assert_next_sample(
+                        self.remote.evt_selectedGrating,
+                        gratingType=grating,
+                        timeout=EVENT_TIMEOUT,
+                    )
 
     async def test_connection_failure(self):
         async with self.make_csc(initial_state=salobj.State.ENABLED, simulation_mode=1):
-            await asyncio.sleep(1)
+            # Wait for the health monitor to be running, so it is the one
+            # that notices the lost connection.
+            await self.remote.tel_loopTime.next(flush=False, timeout=STD_TIMEOUT)
             await self.csc.mock_server.close()
             await self.assert_next_summary_state(state=salobj.State.FAULT, flush=True)
+
+    async def test_connection_failure_after_backoff(self):
+        async with self.make_csc(initial_state=salobj.State.ENABLED, simulation_mode=1):
+            # The controller stays READY, so by the third heartbeat the
+            # health monitor queries its status less often than that.
+            for _ in range(3):
+                await self.remote.tel_loopTime.next(flush=False, timeout=STD_TIMEOUT)
+            await self.csc.mock_server.close()
+            # The lost connection is still reported within about a heartbeat.
+            await self.assert_next_summary_state(
+                state=salobj.State.FAULT,
+                flush=True,
+                timeout=2 * self.csc.heartbeat_interval,
+            )
+
+    async def test_controller_not_ready(self):
+        with mock.patch.object(monochromator_csc, "MockServer", NotReadyMockServer):
+            async with self.make_csc(
+                initial_state=salobj.State.ENABLED, simulation_mode=1
+            ):
+                await self.assert_next_sample(
+                    self.remote.evt_errorCode,
+                    errorCode=ATMonochromator.ErrorCode.HARDWARE_NOT_READY,
+                )
+                await self.assert_next_summary_state(
+                    state=salobj.State.FAULT, flush=True
+                )
+                # The CSC must not carry on as if the controller were ready.
+                assert self.csc.health_monitor_task.done()
+                assert self.csc.detailed_state != ATMonochromator.DetailedState.READY
+                while (data := self.remote.evt_detailedState.get_oldest()) is not None:
+                    assert data.detailedState != ATMonochromator.DetailedState.READY
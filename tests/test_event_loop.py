@@ -0,0 +1,116 @@
+# This file is part of ts_atmonochromator.
+#
+# Developed for the LSST Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+
+
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+from lsst.ts.atmonochromator import event_loop
+
+LOGGER_NAME = event_loop.__name__
+
+HAVE_UVLOOP = importlib.util.find_spec("uvloop") is not None
+
+
+class CustomEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """An event loop policy that can be found by
+    ``TS_MONOCHROMATOR_LOOP_POLICY``.
+    """
+
+    pass
+
+
+class TestInstallEventLoopPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.initial_policy = asyncio.get_event_loop_policy()
+        env_patcher = mock.patch.dict(os.environ)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        for name in (event_loop.LOOP_POLICY_ENV_VAR, event_loop.UVLOOP_ENV_VAR):
+            os.environ.pop(name, None)
+
+    def tearDown(self) -> None:
+        asyncio.set_event_loop_policy(self.initial_policy)
+
+    def test_not_requested(self) -> None:
+        assert not event_loop.install_event_loop_policy()
+        assert asyncio.get_event_loop_policy() is self.initial_policy
+
+        os.environ[event_loop.UVLOOP_ENV_VAR] = "0"
+        assert not event_loop.install_event_loop_policy()
+        assert asyncio.get_event_loop_policy() is self.initial_policy
+
+    def test_loop_policy(self) -> None:
+        os.environ[event_loop.LOOP_POLICY_ENV_VAR] = (
+            f"{__name__}:{CustomEventLoopPolicy.__name__}"
+        )
+        assert event_loop.install_event_loop_policy()
+        policy = asyncio.get_event_loop_policy()
+        assert isinstance(policy, CustomEventLoopPolicy)
+
+        # Installing it again keeps the existing policy.
+        assert event_loop.install_event_loop_policy()
+        assert asyncio.get_event_loop_policy() is policy
+
+    def test_bad_loop_policy(self) -> None:
+        for policy_name in (
+            "no_colon",
+            "too:many:colons",
+            "no_such_module_for_atmonochromator:Policy",
+            f"{__name__}:NoSuchPolicy",
+        ):
+            with self.subTest(policy_name=policy_name):
+                os.environ[event_loop.LOOP_POLICY_ENV_VAR] = policy_name
+                with self.assertLogs(LOGGER_NAME, level="WARNING") as logs:
+                    assert not event_loop.install_event_loop_policy()
+                assert policy_name in logs.output[0]
+                assert asyncio.get_event_loop_policy() is self.initial_policy
+
+    @unittest.skipIf(not HAVE_UVLOOP, "uvloop is not installed")
+    def test_uvloop(self) -> None:
+        import uvloop
+
+        os.environ[event_loop.UVLOOP_ENV_VAR] = "1"
+        assert event_loop.install_event_loop_policy()
+        assert isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy)
+
+    @unittest.skipIf(not HAVE_UVLOOP, "uvloop is not installed")
+    def test_bad_loop_policy_falls_back_to_uvloop(self) -> None:
+        import uvloop
+
+        os.environ[event_loop.LOOP_POLICY_ENV_VAR] = "no_colon"
+        os.environ[event_loop.UVLOOP_ENV_VAR] = "1"
+        with self.assertLogs(LOGGER_NAME, level="WARNING"):
+            assert event_loop.install_event_loop_policy()
+        assert isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy)
+
+    def test_uvloop_not_installed(self) -> None:
+        os.environ[event_loop.UVLOOP_ENV_VAR] = "1"
+        # A None entry in sys.modules makes "import uvloop" fail.
+        with mock.patch.dict(sys.modules, {"uvloop": None}), self.assertLogs(
+            LOGGER_NAME, level="WARNING"
+        ) as logs:
+            assert not event_loop.install_event_loop_policy()
+        assert "uvloop is not installed" in logs.output[0]
+        assert asyncio.get_event_loop_policy() is self.initial_policy
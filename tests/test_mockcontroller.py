@@ -23,73 +23,72 @@ import typing
 import unittest
 
 import numpy as np
-from lsst.ts import atmonochromator
+from lsst.ts.atmonochromator.mock_controller import MockServer
 
 # Standard timeout (seconds)
 STD_TIMEOUT = 10
 
 
-@unittest.skip("Not needed")
 class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
-    """Test MockController"""
+    """Test MockController, talking to it through a MockServer."""
 
     async def asyncSetUp(self) -> None:
-        self.ctrl = atmonochromator.MockController()
+        self.server = MockServer()
+        self.ctrl = self.server.device
 
-        await asyncio.wait_for(self.ctrl.start(), timeout=STD_TIMEOUT)
-        rw_coro = asyncio.open_connection(
-            host=self.ctrl.config.host, port=self.ctrl.port
-        )
-        self.reader, self.writer = await asyncio.wait_for(rw_coro, timeout=STD_TIMEOUT)
+        async with asyncio.timeout(STD_TIMEOUT):
+            await self.server.start_task
+            self.reader, self.writer = await asyncio.open_connection(
+                host=self.server.host, port=self.server.port
+            )
 
     async def asyncTearDown(self) -> None:
-        if self.ctrl is not None:
-            await asyncio.wait_for(self.ctrl.stop(), timeout=STD_TIMEOUT)
-        if self.writer is not None:
-            self.writer.write_eof()
-            await self.writer.drain()
+        async with asyncio.timeout(STD_TIMEOUT):
             self.writer.close()
+            await self.writer.wait_closed()
+            await self.server.close()
 
     async def send_cmd(
         self, cmd: str, timeout: typing.Union[int, float] = STD_TIMEOUT
     ) -> str:
         """Send a command to the mock controller and wait for the reply.
 
-        Return the decoded reply as 0 or more lines of text
-        with the final ">" stripped.
+        The command is sent with the "\\r\\n" terminator appended.
+        Return the decoded reply, with the terminator stripped.
         """
-        self.writer.write(f"{cmd}\n".encode())
+        self.writer.write(cmd.encode() + b"\r\n")
         await self.writer.drain()
-        read_bytes = await asyncio.wait_for(self.reader.readline(), timeout=timeout)
+        async with asyncio.timeout(timeout):
+            read_bytes = await self.reader.readline()
         return read_bytes.decode().strip()
 
     async def test_wl(self) -> None:
         # setup controller
-        reply_lines = await self.send_cmd("!RST 1\r\n")
+        reply_lines = await self.send_cmd("!RST 1")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?WL\r\n")
+        reply_lines = await self.send_cmd("?WL")
         status = reply_lines.split()
         assert status[0] == "#WL"
         assert status[1] == f"{self.ctrl.wavelength}"
 
         # Test minimum value
-        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[0]}\r\n")
+        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[0]}")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?WL\r\n")
+        reply_lines = await self.send_cmd("?WL")
         status = reply_lines.split()
         assert status[0] == "#WL"
         assert status[1] == f"{self.ctrl.wavelength_range[0]}"
 
         # Test maximum value
-        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[1]}\r\n")
+        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[1]}")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?WL\r\n")
+        reply_lines = await self.send_cmd("?WL")
         status = reply_lines.split()
         assert status[0] == "#WL"
         assert status[1] == f"{self.ctrl.wavelength_range[1]}"
@@ -99,28 +98,24 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
         current_wave = float(self.ctrl.wavelength)
 
         # Test below minimum value
-        reply_lines = await self.send_cmd(
-            f"!WL {self.ctrl.wavelength_range[0]-10.}\r\n"
-        )
+        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[0]-10.}")
         status = reply_lines.split()
         assert status[0] == self.ctrl.our
         assert current_wave == self.ctrl.wavelength
 
         # Test above maximum value
-        reply_lines = await self.send_cmd(
-            f"!WL {self.ctrl.wavelength_range[1]+10.}\r\n"
-        )
+        reply_lines = await self.send_cmd(f"!WL {self.ctrl.wavelength_range[1]+10.}")
         status = reply_lines.split()
         assert status[0] == self.ctrl.our
         assert current_wave == self.ctrl.wavelength
 
     async def test_gr(self) -> None:
         # setup controller
-        reply_lines = await self.send_cmd("!RST 1\r\n")
+        reply_lines = await self.send_cmd("!RST 1")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?GR\r\n")
+        reply_lines = await self.send_cmd("?GR")
         status = reply_lines.split()
         assert status[0] == "#GR"
         assert status[1] == f"{self.ctrl.grating}"
@@ -128,7 +123,7 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
         # Test each valid value
         for value in self.ctrl.grating_options:
             with self.subTest(cmd=f"!GR {value}"):
-                reply_lines = await self.send_cmd(f"!GR {value}\r\n")
+                reply_lines = await self.send_cmd(f"!GR {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.ok
                 assert value == self.ctrl.grating
@@ -138,26 +133,26 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
 
         for value in (-1, 10, "FOO"):
             with self.subTest(cmd=f"!GR {value}"):
-                reply_lines = await self.send_cmd(f"!GR {value}\r\n")
+                reply_lines = await self.send_cmd(f"!GR {value}")
                 status = reply_lines.split()
                 assert status[0] != self.ctrl.ok
                 assert current_value == self.ctrl.grating
 
     async def test_ens(self) -> None:
         # setup controller
-        reply_lines = await self.send_cmd("!RST 1\r\n")
+        reply_lines = await self.send_cmd("!RST 1")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?ENS\r\n")
+        reply_lines = await self.send_cmd("?ENS")
         status = reply_lines.split()
         assert status[0] == "#ENS"
         assert status[1] == f"{self.ctrl.entrance_slit_position}"
 
         # Test range of valid values
-        for value in np.linspace(*self.ctrl.entrance_slit_range):
+        for value in np.linspace(*self.ctrl.entrance_slit_range, num=5):
             with self.subTest(cmd=f"!ENS {value}"):
-                reply_lines = await self.send_cmd(f"!ENS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!ENS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.ok
                 assert value == self.ctrl.entrance_slit_position
@@ -170,7 +165,7 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
             self.ctrl.entrance_slit_range[1] + 10,
         ):
             with self.subTest(cmd=f"!ENS {value}"):
-                reply_lines = await self.send_cmd(f"!ENS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!ENS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.our
                 assert current_value == self.ctrl.entrance_slit_position
@@ -178,26 +173,26 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
         # Test invalid values
         for value in ("FOO", "bar"):
             with self.subTest(cmd=f"!ENS {value}"):
-                reply_lines = await self.send_cmd(f"!ENS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!ENS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.rejected
                 assert current_value == self.ctrl.entrance_slit_position
 
     async def test_exs(self) -> None:
         # setup controller
-        reply_lines = await self.send_cmd("!RST 1\r\n")
+        reply_lines = await self.send_cmd("!RST 1")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        reply_lines = await self.send_cmd("?EXS\r\n")
+        reply_lines = await self.send_cmd("?EXS")
         status = reply_lines.split()
         assert status[0] == "#EXS"
         assert status[1] == f"{self.ctrl.exit_slit_position}"
 
         # Test range of valid values
-        for value in np.linspace(*self.ctrl.exit_slit_range):
+        for value in np.linspace(*self.ctrl.exit_slit_range, num=5):
             with self.subTest(cmd=f"!EXS {value}"):
-                reply_lines = await self.send_cmd(f"!EXS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!EXS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.ok
                 assert value == self.ctrl.exit_slit_position
@@ -210,7 +205,7 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
             self.ctrl.exit_slit_range[1] + 10,
         ):
             with self.subTest(cmd=f"!EXS {value}"):
-                reply_lines = await self.send_cmd(f"!EXS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!EXS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.our
                 assert current_value == self.ctrl.exit_slit_position
@@ -218,35 +213,31 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
         # Test invalid values
         for value in ("FOO", "bar"):
             with self.subTest(cmd=f"!EXS {value}"):
-                reply_lines = await self.send_cmd(f"!EXS {value}\r\n")
+                reply_lines = await self.send_cmd(f"!EXS {value}")
                 status = reply_lines.split()
                 assert status[0] == self.ctrl.rejected
                 assert current_value == self.ctrl.exit_slit_position
 
     async def test_set(self) -> None:
         # setup controller
-        reply_lines = await self.send_cmd("!RST 1\r\n")
+        reply_lines = await self.send_cmd("!RST 1")
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
 
-        max_w = self.ctrl.wavelength_range[1]
-        min_w = self.ctrl.wavelength_range[0]
-        wavelength = np.random.random() * (max_w - min_w) + min_w
-        grating = np.random.randint(
-            self.ctrl.grating_options[0], self.ctrl.grating_options[-1]
+        rng = np.random.default_rng()
+        # Draw the wavelength and both slit widths in one call.
+        low, high = zip(
+            self.ctrl.wavelength_range,
+            self.ctrl.entrance_slit_range,
+            self.ctrl.exit_slit_range,
+        )
+        wavelength, front_slit, exit_slit = rng.uniform(low, high).tolist()
+        grating = int(
+            rng.integers(self.ctrl.grating_options[0], self.ctrl.grating_options[-1])
         )
-
-        max_f = self.ctrl.entrance_slit_range[1]
-        min_f = self.ctrl.entrance_slit_range[0]
-
-        front_slit = np.random.random() * (max_f - min_f) + min_f
-
-        max_e = self.ctrl.exit_slit_range[1]
-        min_e = self.ctrl.exit_slit_range[0]
-        exit_slit = np.random.random() * (max_e - min_e) + min_e
 
         reply_lines = await self.send_cmd(
-            f"!SET {wavelength} " f"{grating} " f"{front_slit} " f"{exit_slit}\r\n"
+            f"!SET {wavelength} {grating} {front_slit} {exit_slit}"
         )
         status = reply_lines.split()
         assert status[0] == self.ctrl.ok
@@ -254,3 +245,22 @@ class MockControllerTestCase(unittest.IsolatedAsyncioTestCase):
         assert grating == self.ctrl.grating
         assert front_slit == self.ctrl.entrance_slit_position
         assert exit_slit == self.ctrl.exit_slit_position
+
+    async def test_set_attributes(self) -> None:
+        # Fill the cached replies.
+        for cmd in ("?WL", "?GR", "?ENS", "?EXS"):
+            await self.send_cmd(cmd)
+
+        # Setting the attributes directly must not leave stale replies.
+        self.ctrl.wavelength = 500.0
+        self.ctrl.grating = 2
+        self.ctrl.entrance_slit_position = 1.5
+        self.ctrl.exit_slit_position = 2.5
+
+        assert await self.send_cmd("?WL") == f"#WL {500.0}"
+        assert await self.send_cmd("?GR") == "#GR 2"
+        assert await self.send_cmd("?ENS") == f"#ENS {1.5}"
+        assert await self.send_cmd("?EXS") == f"#EXS {2.5}"
+
+        self.ctrl.wavelength_offset = 1.0
+        assert await self.send_cmd("?WL") == f"#WL {501.0}"
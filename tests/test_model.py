@@ -186,6 +186,27 @@ class ModelTestCase(unittest.IsolatedAsyncioTestCase):
                 assert reply == atmonochromator.ModelReply.REJECTED
                 assert current_ens == self.server.device.exit_slit_position
 
+    async def test_calibrate_wavelength(self) -> None:
+        # setup controller
+        reply = await self.model.reset_controller()
+        assert reply == atmonochromator.ModelReply.OK
+
+        wavelength = self.server.device.wavelength
+        offset = 10.0
+        reply = await self.model.set_calibrate_wavelength(offset)
+        assert reply == atmonochromator.ModelReply.OK
+        assert self.server.device.wavelength_offset == offset
+
+        reply = await self.model.get_wavelength()
+        assert reply == wavelength + offset
+
+        # Test out of range
+        reply = await self.model.set_calibrate_wavelength(
+            self.server.device.wavelength_range[1]
+        )
+        assert reply == atmonochromator.ModelReply.OUT_OF_RANGE
+        assert self.server.device.wavelength_offset == offset
+
     async def test_set(self) -> None:
 
         # setup controller
@@ -227,3 +248,133 @@ class ModelTestCase(unittest.IsolatedAsyncioTestCase):
 
         reply = await self.model.get_status()
         assert reply == Status.READY
+
+    async def test_get_all(self) -> None:
+        reply = await self.model.reset_controller()
+        assert reply == atmonochromator.ModelReply.OK
+
+        reply = await self.model.set_all(600.0, 1, 2.0, 3.0)
+        assert reply == atmonochromator.ModelReply.OK
+
+        assert await self.model.get_all() == (
+            self.server.device.wavelength,
+            self.server.device.grating,
+            self.server.device.entrance_slit_position,
+            self.server.device.exit_slit_position,
+        )
+
+    async def test_pipelined_replies(self) -> None:
+        reply = await self.model.reset_controller()
+        assert reply == atmonochromator.ModelReply.OK
+
+        reply = await self.model.set_all(600.0, 1, 2.0, 3.0)
+        assert reply == atmonochromator.ModelReply.OK
+
+        # Send many queries without waiting for replies in between;
+        # each must get the reply to its own query.
+        replies = await asyncio.gather(
+            *itertools.chain.from_iterable(
+                (
+                    self.model.get_wavelength(),
+                    self.model.get_grating(),
+                    self.model.get_entrance_slit(),
+                    self.model.get_exit_slit(),
+                    self.model.get_status(),
+                )
+                for _ in range(5)
+            )
+        )
+        assert replies == [600.0, 1, 2.0, 3.0, Status.READY] * 5
+
+    async def test_reply_timeout(self) -> None:
+        # Make the controller slow to reply to moves.
+        self.server.device.wait_time = 1
+
+        move_task = asyncio.create_task(self.model.send_cmd("!WL 500", timeout=0.1))
+        await asyncio.sleep(0)
+        status_task = asyncio.create_task(self.model.get_status())
+
+        # Once a command times out waiting for its reply, later replies
+        # cannot be matched to their commands, so the connection is dropped.
+        with self.assertRaises(TimeoutError):
+            await move_task
+        with self.assertRaises(ConnectionError):
+            await status_task
+        assert not self.model.connected
+        with self.assertRaises(RuntimeError):
+            await self.model.get_status()
+
+    async def test_cancelled_command(self) -> None:
+        self.server.device.wait_time = 0.2
+
+        move_task = asyncio.create_task(self.model.send_cmd("!WL 500"))
+        await asyncio.sleep(0)
+        status_task = asyncio.create_task(self.model.get_status())
+        await asyncio.sleep(0.1)
+        move_task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await move_task
+
+        # Cancelling a command keeps the connection; its reply is discarded
+        # and later commands still get their own replies.
+        assert self.model.connected
+        assert await status_task == Status.READY
+        assert await self.model.get_wavelength() == 500.0
+
+    async def test_read_loop_failure(self) -> None:
+        self.server.device.wait_time = 1
+
+        move_task = asyncio.create_task(self.model.send_cmd("!WL 500"))
+        await asyncio.sleep(0)
+        await self.server.close()
+
+        with self.assertRaises(ConnectionError):
+            await move_task
+        assert not self.model.connected
+        assert self.model.should_be_connected
+        with self.assertRaises(RuntimeError):
+            await self.model.get_status()
+
+    async def test_read_loop_bad_reply(self) -> None:
+        self.server.device.wait_time = 1
+
+        move_task = asyncio.create_task(self.model.send_cmd("!WL 500"))
+        await asyncio.sleep(0)
+        # A reply longer than the stream limit fails the read loop,
+        # though the TCP/IP connection itself is still open.
+        await self.server.write(b"x" * 200_000)
+
+        with self.assertRaises(asyncio.LimitOverrunError):
+            await move_task
+        assert not self.model.connected
+        assert self.model.should_be_connected
+        # The client is closed along with the connection.
+        assert not self.model.client.connected
+
+    async def test_latency_report(self) -> None:
+        # Discard the statistics from connecting.
+        self.model.pop_latency_report()
+
+        await self.model.get_status()
+        await self.model.get_status()
+        await self.model.get_wavelength()
+
+        report = self.model.pop_latency_report()
+        assert report.startswith("?SWST(count=2, ")
+        assert ", ?WL(count=1, " in report
+        assert self.model.pop_latency_report() == ""
+
+    async def test_inproc(self) -> None:
+        device = atmonochromator.MockController()
+        model = atmonochromator.Model(logging.getLogger())
+        model.attach_inproc(device)
+
+        reply = await model.reset_controller()
+        assert reply == atmonochromator.ModelReply.OK
+
+        reply = await model.get_status()
+        assert reply == Status.READY
+
+        reply = await model.set_grating(device.grating_options[-1])
+        assert reply == atmonochromator.ModelReply.OK
+        assert await model.get_grating() == device.grating_options[-1]